@@ -1,6 +1,29 @@
+import argparse
+import atexit
+import concurrent.futures
+import contextlib
+import cProfile
+import functools
+import hashlib
+import io
 import json
+import multiprocessing
 import os
+import pstats
+import re
+import shlex
+import shutil
+import signal
+import socket
+import socketserver
+import stat
 import subprocess
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
 from typing import Any, Optional, Union
 
 
@@ -10,16 +33,140 @@ VERSION: str = "0.0.2"
 SOURCE_DIRECTORY_NAME: str = "src"
 TESTING_ROM_ABSOLUTE_PATH: str = os.path.abspath("testing_rom.rom")
 ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY: str = os.path.abspath("tests")
+ABSOLUTE_PATH_TO_OBJECT_CACHE_DIRECTORY: str = os.path.abspath(
+    os.path.join(".ce_autotest_cache", "objects")
+)
+ABSOLUTE_PATH_TO_DURATION_HISTORY_FILE: str = os.path.abspath(
+    os.path.join(".ce_autotest_cache", "history.json")
+)
+ABSOLUTE_PATH_TO_LOG_DIRECTORY: str = os.path.abspath("test_logs")
 IGNORED_DEPENDENCIES_JSON_FILENAME: str = "ignored_dependencies.json"
 TEST_INFO_JSON_FILENAME: str = "test_info.json"
 TEST_SOURCE_DIRECTORY_NAME: str = "src"
 AUTOTEST_JSON_FILENAME: str = "autotest.json"
+BUNDLE_MANIFEST_FILENAME: str = "bundle.json"
+AUTOTESTER_COMMAND: str = "cemu-autotester"
+PERFORMANCE_MARKER_PREFIX: str = "ATF_PERF"
 
 TERMINAL_LINE_WIDTH: int = 80
 CLEAN_THEN_BUILD_TESTS: bool = False
 ABORT_ON_FIRST_FAILED_TEST: bool = False
 PRINT_DEPENDENCY_TRACE_INFO: bool = False
 PRINT_BATCH_BUILDING: bool = False
+USE_OBJECT_CACHE: bool = True
+DEFAULT_BUILD_TIMEOUT: float = 600.0
+DEFAULT_EXECUTE_TIMEOUT: float = 120.0
+NUM_RETRIES: int = 0
+CONSOLE_MODE: str = "verbose"
+EVENT_BUFFER_SIZE: int = 64
+UPDATE_PERFORMANCE_BASELINES: bool = False
+DEFAULT_PERFORMANCE_TOLERANCE: float = 0.05
+UPDATE_CODE_SIZE_BASELINES: bool = False
+DEFAULT_CODE_SIZE_TOLERANCE: float = 0.05
+SESSION_SIZE: int = 1
+NUM_JOBS: int = os.cpu_count() or 1
+NUM_PLAN_EXECUTORS: int = 1
+NUM_RESOURCE_USAGE_ROWS: int = 10
+PROFILE_HOT_PATHS: bool = False
+
+# Programs that share an emulator session are renamed so that they can live
+# side by side on the calculator. Each name starts with a different letter, so
+# the program menu jumps to it with a single alpha key press.
+SESSION_PROGRAM_LAUNCH_KEYS: dict[str, str] = {
+    "A": "math",
+    "B": "apps",
+    "C": "prgm",
+    "E": "sin",
+    "F": "cos",
+    "G": "tan",
+    "N": "log",
+    "S": "ln",
+}
+# Extensions of the source files that the toolchain compiles into listings.
+SOURCE_FILE_EXTENSIONS: set[str] = {".c", ".cc", ".cpp", ".cxx"}
+# Compiler options that add an include directory. The object cache leaves them
+# out of its keys, because the headers they find are in the preprocessed
+# source.
+INCLUDE_DIRECTORY_OPTIONS: tuple[str, ...] = ("-I", "-idirafter", "-iquote", "-isystem")
+# Assembler directives that can appear between a function's label and its
+# end. Everything else indented in a listing is an instruction.
+ASSEMBLER_DIRECTIVES: set[str] = {
+    "assume",
+    "db",
+    "dl",
+    "dw",
+    "extern",
+    "private",
+    "public",
+    "rb",
+    "section",
+}
+EZ80_REGISTERS: set[str] = {
+    "a",
+    "af",
+    "af'",
+    "b",
+    "bc",
+    "c",
+    "d",
+    "de",
+    "e",
+    "h",
+    "hl",
+    "i",
+    "ix",
+    "ixh",
+    "ixl",
+    "iy",
+    "iyh",
+    "iyl",
+    "l",
+    "mb",
+    "r",
+    "sp",
+}
+EZ80_WIDE_REGISTERS: set[str] = {"bc", "de", "hl", "ix", "iy", "sp"}
+EZ80_CONDITIONS: set[str] = {"c", "m", "nc", "nz", "p", "pe", "po", "z"}
+EZ80_ED_PREFIXED_MNEMONICS: set[str] = {
+    "cpd",
+    "cpdr",
+    "cpi",
+    "cpir",
+    "im",
+    "in0",
+    "ldd",
+    "lddr",
+    "ldi",
+    "ldir",
+    "lea",
+    "mlt",
+    "neg",
+    "out0",
+    "pea",
+    "reti",
+    "retn",
+    "rld",
+    "rrd",
+    "slp",
+    "stmix",
+    "rsmix",
+    "tst",
+}
+EZ80_CB_PREFIXED_MNEMONICS: set[str] = {
+    "bit",
+    "res",
+    "rl",
+    "rlc",
+    "rr",
+    "rrc",
+    "set",
+    "sla",
+    "sra",
+    "srl",
+}
+AUTOTESTER_HASH_RESULT_PATTERN: re.Pattern = re.compile(
+    r"\[(OK|FAIL)\] Hash #(\d+)", re.IGNORECASE
+)
 
 
 class IgnoredFunctions:
@@ -162,787 +309,4562 @@ def print_advice(advice: Optional[list[str]]) -> None:
     return
 
 
+class EventBus:
+    """
+    Delivers timestamped progress events to every subscriber. A subscriber is
+    any object with handle_event(event) and close() methods.
+    """
+
+    _subscribers: list[Any] = []
+
+    def __init__(self):
+        self._subscribers = []
+        return
+
+    def subscribe(self, subscriber: Any) -> None:
+        self._subscribers.append(subscriber)
+        return
+
+    def emit(self, event_type: str, **fields) -> None:
+        event: dict[str, Any] = {"event": event_type, "timestamp": time.time()}
+        event.update(fields)
+
+        self.forward(event)
+        return
+
+    def forward(self, event: dict[str, Any]) -> None:
+        """
+        Delivers an event that was emitted elsewhere, keeping its timestamp.
+        """
+        for subscriber in self._subscribers:
+            subscriber.handle_event(event)
+
+        return
+
+    def close(self) -> None:
+        for subscriber in self._subscribers:
+            subscriber.close()
+
+        self._subscribers = []
+        return
+
+
+class EventRecorder:
+    """
+    Keeps the events it receives so that they can be forwarded later.
+    """
+
+    def __init__(self):
+        self.events: list[dict[str, Any]] = []
+        return
+
+    def handle_event(self, event: dict[str, Any]) -> None:
+        self.events.append(event)
+        return
+
+    def close(self) -> None:
+        return
+
+
+class JsonLinesEventWriter:
+    """
+    Writes each event as one line of JSON. Lines are written in blocks of
+    EVENT_BUFFER_SIZE events to keep the number of writes low.
+    """
+
+    def __init__(self, absolute_filepath: str):
+        self._file = open(absolute_filepath, "w")
+        self._buffer: list[str] = []
+        return
+
+    def handle_event(self, event: dict[str, Any]) -> None:
+        self._buffer.append(json.dumps(event) + "\n")
+
+        if len(self._buffer) >= EVENT_BUFFER_SIZE:
+            self._flush()
+
+        return
+
+    def _flush(self) -> None:
+        self._file.write("".join(self._buffer))
+        self._file.flush()
+        self._buffer = []
+        return
+
+    def close(self) -> None:
+        self._flush()
+        self._file.close()
+        return
+
+
+class JUnitReportWriter:
+    """
+    Collects the result of each executed test and writes them as a JUnit XML
+    report when the event bus closes. A failed code size check is reported
+    as a failed test case of its own.
+    """
+
+    def __init__(self, absolute_filepath: str):
+        self._absolute_filepath = absolute_filepath
+        self._test_results: list[dict[str, Any]] = []
+        self._start_timestamp: float = time.time()
+        return
+
+    def handle_event(self, event: dict[str, Any]) -> None:
+        if event["event"] == "test_result":
+            self._test_results.append(event)
+        elif event["event"] == "code_size_failure":
+            self._test_results.append(
+                {
+                    "test": event["test"] + " (code size)",
+                    "outcome": "code size",
+                    "message": f"'{event['test']}' failed its code size check.",
+                    "attempts": [],
+                    "duration": 0.0,
+                    "log": None,
+                }
+            )
+
+        return
+
+    def close(self) -> None:
+        num_failures: int = len(
+            [result for result in self._test_results if result["outcome"] != "passed"]
+        )
+        test_suites = ElementTree.Element("testsuites")
+        test_suite = ElementTree.SubElement(
+            test_suites,
+            "testsuite",
+            name="ce-autotest",
+            tests=str(len(self._test_results)),
+            failures=str(num_failures),
+            time=f"{time.time() - self._start_timestamp:.3f}",
+        )
+
+        for result in self._test_results:
+            class_name, _, test_name = result["test"].rpartition(os.sep)
+            test_case = ElementTree.SubElement(
+                test_suite,
+                "testcase",
+                classname=class_name.replace(os.sep, ".") or "tests",
+                name=test_name,
+                time=f"{result['duration']:.3f}",
+            )
+
+            if result["outcome"] != "passed":
+                failure = ElementTree.SubElement(
+                    test_case, "failure", message=result.get("message") or ""
+                )
+                failure.text = f"Outcome: {result['outcome']}"
+
+                if result["log"] is not None:
+                    failure.text += f"\nLog: {result['log']}"
+
+            if result["log"] is not None:
+                ElementTree.SubElement(test_case, "system-out").text = (
+                    f"{len(result['attempts'])} attempt(s), log: {result['log']}"
+                )
+
+        ElementTree.ElementTree(test_suites).write(
+            self._absolute_filepath, encoding="utf-8", xml_declaration=True
+        )
+        return
+
+
+class CompactConsoleRenderer:
+    """
+    Replaces the detailed console output with a single progress line, plus a
+    line for each warning and failed test. The detailed output still goes to
+    the run log and the per-test log files.
+    """
+
+    def __init__(self, stream: Any):
+        self._stream = stream
+        self._interactive: bool = stream.isatty()
+        self._counts: dict[str, int] = {"built": 0, "executed": 0, "failed": 0}
+        self._num_tests_to_execute: Optional[int] = None
+        self._current_activity: str = ""
+        return
+
+    def _write_line(self, line: str) -> None:
+        if self._interactive:
+            self._stream.write("\r" + " " * TERMINAL_LINE_WIDTH + "\r")
+
+        self._stream.write(line + "\n")
+        self._render_progress_line()
+        return
+
+    def _render_progress_line(self) -> None:
+        if not self._interactive:
+            self._stream.flush()
+            return
+
+        executed: str = str(self._counts["executed"])
+
+        if self._num_tests_to_execute is not None:
+            executed += f"/{self._num_tests_to_execute}"
+
+        line: str = (
+            f"built {self._counts['built']} | executed {executed}"
+            f" | failed {self._counts['failed']} | {self._current_activity}"
+        )
+        self._stream.write("\r" + line[:TERMINAL_LINE_WIDTH].ljust(TERMINAL_LINE_WIDTH))
+        self._stream.flush()
+        return
+
+    def handle_event(self, event: dict[str, Any]) -> None:
+        event_type: str = event["event"]
+
+        if event_type == "phase_start" and event["phase"] == "execute":
+            self._num_tests_to_execute = event.get("total")
+        elif event_type == "execute_start" and event.get("session", False):
+            # The progress line already shows the session.
+            pass
+        elif event_type in ("build_start", "trace_start", "execute_start"):
+            self._current_activity = (
+                event_type.removesuffix("_start") + " " + event["test"]
+            )
+        elif event_type == "session_start":
+            self._current_activity = f"execute session of {len(event['tests'])}"
+        elif event_type == "build_finish":
+            self._counts["built"] += 1
+        elif event_type == "test_result":
+            self._counts["executed"] += 1
+
+            if event["outcome"] != "passed":
+                self._counts["failed"] += 1
+                self._write_line(
+                    f"FAILED {event['test']} ({event['outcome']}), see {event['log']}"
+                )
+        elif event_type == "code_size_failure":
+            self._write_line(f"FAILED {event['test']} (code size)")
+        elif event_type == "warning":
+            self._write_line("WARNING: " + event["message"])
+        elif event_type == "fatal_error":
+            self._write_line("FATAL ERROR: " + event["message"])
+        elif event_type == "run_finish":
+            self._current_activity = "done"
+            self._write_line("")
+            self._stream.write(
+                f"{event['num_tests_executed']} tests executed, "
+                f"{event['num_tests_failed']} failed in {event['duration']:.1f} s.\n"
+            )
+
+            if event["num_tests_failed_code_size"] > 0:
+                self._stream.write(
+                    f"{event['num_tests_failed_code_size']} tests failed their"
+                    " code size check.\n"
+                )
+            return
+
+        self._render_progress_line()
+        return
+
+    def close(self) -> None:
+        self._stream.flush()
+        return
+
+
+def load_duration_history(absolute_filepath: str) -> dict[str, dict[str, float]]:
+    """
+    Returns the recorded durations of each test's phases, keyed by test
+    identifier, or an empty history if none was recorded yet.
+    """
+    try:
+        with open(absolute_filepath, "r") as file:
+            return json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+class DurationHistoryWriter:
+    """
+    Records how long each test took to build, trace, and execute, so that
+    the cost of later runs can be estimated. Each phase keeps the duration
+    from the most recent run that performed it.
+    """
+
+    def __init__(self, absolute_filepath: str):
+        self._absolute_filepath: str = absolute_filepath
+        self._durations: dict[str, dict[str, float]] = {}
+        return
+
+    def handle_event(self, event: dict[str, Any]) -> None:
+        phase: Optional[str] = None
+
+        if event["event"] in ("build_finish", "trace_finish"):
+            phase = event["event"].removesuffix("_finish")
+        elif event["event"] == "test_result":
+            phase = "execute"
+
+        if phase is not None:
+            self._durations.setdefault(event["test"], {})[phase] = round(
+                event["duration"], 3
+            )
+
+        return
+
+    def close(self) -> None:
+        if len(self._durations) == 0:
+            return
+
+        history: dict[str, dict[str, float]] = load_duration_history(
+            self._absolute_filepath
+        )
+
+        for test_identifier, durations in self._durations.items():
+            history.setdefault(test_identifier, {}).update(durations)
+
+        os.makedirs(os.path.dirname(self._absolute_filepath), exist_ok=True)
+        write_json_file_if_changed(self._absolute_filepath, history)
+        self._durations = {}
+        return
+
+
+class PhaseProfiler:
+    """
+    Profiles the script with cProfile and writes one .pstats file for each
+    phase of the run. Work done before the first phase is profiled as the
+    "setup" phase. Pool workers profile their own calls and hand back
+    snapshots, which are merged into the phase that was running.
+    """
+
+    def __init__(self, absolute_directory_path: str):
+        os.makedirs(absolute_directory_path, exist_ok=True)
+        self._absolute_directory_path: str = absolute_directory_path
+        self._phase: Optional[str] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._absolute_snapshot_paths: list[str] = []
+        self._start_phase("setup")
+        return
+
+    def _start_phase(self, phase: str) -> None:
+        self._phase = phase
+        self._absolute_snapshot_paths = []
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        return
+
+    def _finish_phase(self) -> None:
+        if self._profiler is None:
+            return
+
+        self._profiler.disable()
+
+        try:
+            stats = pstats.Stats(self._profiler)
+        except TypeError:
+            # Nothing was profiled.
+            return
+        finally:
+            self._profiler = None
+
+        for absolute_snapshot_path in self._absolute_snapshot_paths:
+            stats.add(absolute_snapshot_path)
+            os.remove(absolute_snapshot_path)
+
+        stats.dump_stats(
+            os.path.join(self._absolute_directory_path, self._phase + ".pstats")
+        )
+        return
+
+    def add_snapshot(self, absolute_snapshot_path: str) -> None:
+        self._absolute_snapshot_paths.append(absolute_snapshot_path)
+        return
+
+    def stop(self) -> None:
+        """
+        Stops profiling without writing anything. Pool workers call this for
+        the copy of the profiler they inherit when they are forked.
+        """
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler = None
+
+        return
+
+    def handle_event(self, event: dict[str, Any]) -> None:
+        if event["event"] == "phase_start" and event["phase"] != self._phase:
+            self._finish_phase()
+            self._start_phase(event["phase"])
+
+        return
+
+    def close(self) -> None:
+        self._finish_phase()
+        return
+
+
+EVENT_BUS: EventBus = EventBus()
+PHASE_PROFILER: Optional[PhaseProfiler] = None
+RESOURCE_USAGE_RECORDS: list[dict[str, Any]] = []
+RESOURCE_USAGE_SCOPE: dict[str, Optional[str]] = {"test": None, "phase": None}
+# Call counts, cumulative time, and input parsed by each hot path, the time
+# spent in each stack of hot paths, and the hot paths that are running. Only
+# kept when PROFILE_HOT_PATHS is set.
+HOT_PATH_COUNTERS: dict[str, dict[str, float]] = {}
+HOT_PATH_STACK_TIMES: dict[str, float] = {}
+HOT_PATH_STACK: list[list[Any]] = []
+
+
+def get_test_log_path(test_identifier: str, phase: str) -> str:
+    """
+    Returns the absolute path to the log file that holds the output of the
+    test's subprocesses for one phase ("clean", "build", or "execute").
+    """
+    absolute_log_directory_path: str = os.path.join(
+        ABSOLUTE_PATH_TO_LOG_DIRECTORY, test_identifier
+    )
+    os.makedirs(absolute_log_directory_path, exist_ok=True)
+    return os.path.join(absolute_log_directory_path, phase + ".log")
+
+
+def print_log_file(absolute_log_path: str) -> None:
+    if CONSOLE_MODE != "verbose":
+        return
+
+    with open(absolute_log_path, "r", errors="replace") as file:
+        sys.stdout.write(file.read())
+
+    return
+
+
 def report_warning(message: str, advice: Optional[list[str]] = None) -> None:
+    EVENT_BUS.emit("warning", message=message)
     print_empty_line()
     print_and_wrap_on_space("WARNING: " + message)
     print_advice(advice)
     return
 
 
-def report_fatal_error_then_exit(
-    message: str, advice: Optional[list[str]] = None
-) -> None:
-    print_empty_line()
-    print_and_wrap_on_space("FATAL ERROR: " + message)
-    print_advice(advice)
-    print_empty_line()
-    print_divider()
-    print_empty_line()
-    print_centered("TESTING ABORTED")
-    print_empty_line()
-    exit(1)
+def report_fatal_error_then_exit(
+    message: str, advice: Optional[list[str]] = None
+) -> None:
+    EVENT_BUS.emit("fatal_error", message=message)
+    EVENT_BUS.close()
+    print_empty_line()
+    print_and_wrap_on_space("FATAL ERROR: " + message)
+    print_advice(advice)
+    print_empty_line()
+    print_divider()
+    print_empty_line()
+    print_centered("TESTING ABORTED")
+    print_empty_line()
+    exit(1)
+
+
+def call_with_captured_output(function: Any, *arguments) -> dict[str, Any]:
+    """
+    Calls the function with its console output and events captured instead of
+    delivered, so that work done in a process pool can be reported in a fixed
+    order. Pass the returned capture to replay_captured_output().
+    """
+    global EVENT_BUS
+
+    parent_event_bus: EventBus = EVENT_BUS
+    parent_resource_usage_scope: dict[str, Optional[str]] = RESOURCE_USAGE_SCOPE.copy()
+    num_resource_usage_records: int = len(RESOURCE_USAGE_RECORDS)
+    parent_hot_path_counters: dict[str, dict[str, float]] = {
+        name: counters.copy() for name, counters in HOT_PATH_COUNTERS.items()
+    }
+    parent_hot_path_stack_times: dict[str, float] = HOT_PATH_STACK_TIMES.copy()
+    event_recorder = EventRecorder()
+    output = io.StringIO()
+    capture: dict[str, Any] = {"result": None, "exit_code": None, "profile": None}
+    profiler: Optional[cProfile.Profile] = None
+    start_time: float = time.monotonic()
+
+    # In the main process, the calls are already covered by PHASE_PROFILER.
+    if PHASE_PROFILER is not None and multiprocessing.parent_process() is not None:
+        profiler = cProfile.Profile()
+
+    EVENT_BUS = EventBus()
+    EVENT_BUS.subscribe(event_recorder)
+    set_resource_usage_scope(None, None)
+    HOT_PATH_COUNTERS.clear()
+    HOT_PATH_STACK_TIMES.clear()
+
+    try:
+        with contextlib.redirect_stdout(output):
+            if profiler is not None:
+                capture["result"] = profiler.runcall(function, *arguments)
+            else:
+                capture["result"] = function(*arguments)
+    except SystemExit as error:
+        capture["exit_code"] = error.code
+    finally:
+        EVENT_BUS = parent_event_bus
+        RESOURCE_USAGE_SCOPE.update(parent_resource_usage_scope)
+
+    if profiler is not None:
+        file_descriptor, capture["profile"] = tempfile.mkstemp(suffix=".pstats")
+        os.close(file_descriptor)
+        profiler.dump_stats(capture["profile"])
+
+    capture["output"] = output.getvalue()
+    capture["events"] = event_recorder.events
+    capture["resource_usage"] = RESOURCE_USAGE_RECORDS[num_resource_usage_records:]
+    capture["hot_path_counters"] = dict(HOT_PATH_COUNTERS)
+    capture["hot_path_stack_times"] = dict(HOT_PATH_STACK_TIMES)
+    capture["duration"] = time.monotonic() - start_time
+    del RESOURCE_USAGE_RECORDS[num_resource_usage_records:]
+    HOT_PATH_COUNTERS.clear()
+    HOT_PATH_COUNTERS.update(parent_hot_path_counters)
+    HOT_PATH_STACK_TIMES.clear()
+    HOT_PATH_STACK_TIMES.update(parent_hot_path_stack_times)
+    return capture
+
+
+def replay_captured_output(capture: dict[str, Any]) -> Any:
+    """
+    Prints the captured console output, forwards the captured events, and
+    records the captured resource usage in the current scope. Hot path
+    counters and profiles taken by the function are merged into the run's. If
+    the function exited, exits the same way; otherwise returns its result.
+    """
+    sys.stdout.write(capture["output"])
+    merge_hot_path_counters(
+        capture["hot_path_counters"], capture["hot_path_stack_times"]
+    )
+
+    if capture["profile"] is not None:
+        PHASE_PROFILER.add_snapshot(capture["profile"])
+
+    for event in capture["events"]:
+        EVENT_BUS.forward(event)
+
+    for record in capture["resource_usage"]:
+        RESOURCE_USAGE_RECORDS.append(
+            record
+            | {
+                "test": record["test"] or RESOURCE_USAGE_SCOPE["test"],
+                "phase": record["phase"] or RESOURCE_USAGE_SCOPE["phase"],
+            }
+        )
+
+    if capture["exit_code"] is not None:
+        EVENT_BUS.close()
+        exit(capture["exit_code"])
+
+    return capture["result"]
+
+
+def get_pool_worker_settings() -> dict[str, Any]:
+    """
+    Returns the script's settings, such as the timeouts and whether hot paths
+    are counted, so that pool workers can run with the same ones.
+    """
+    return {
+        name: value
+        for name, value in globals().items()
+        if name.isupper() and isinstance(value, (bool, int, float, str))
+    }
+
+
+def initialize_pool_worker(settings: dict[str, Any]) -> None:
+    """
+    A forked worker inherits the settings that the command line arguments
+    set, but a worker started with spawn or forkserver imports the script
+    afresh and only has the defaults, so the settings are applied again.
+    Such a worker has no PHASE_PROFILER, so its calls are not profiled.
+
+    settings: The main process's settings, from get_pool_worker_settings().
+    """
+    globals().update(settings)
+
+    if PHASE_PROFILER is not None:
+        PHASE_PROFILER.stop()
+
+    return
+
+
+def call_in_process_pool(
+    function: Any, argument_tuples: list[tuple]
+) -> list[dict[str, Any]]:
+    """
+    Calls the function once for each argument tuple through
+    call_with_captured_output(), using up to NUM_JOBS processes, and returns
+    the captures in the order of argument_tuples.
+    """
+    if NUM_JOBS < 2 or len(argument_tuples) < 2:
+        return [
+            call_with_captured_output(function, *arguments)
+            for arguments in argument_tuples
+        ]
+
+    # Forked workers start with everything the main process has set up, so
+    # fork is used wherever it exists, even where it is not the default.
+    mp_context: Optional[multiprocessing.context.BaseContext] = None
+
+    if "fork" in multiprocessing.get_all_start_methods():
+        mp_context = multiprocessing.get_context("fork")
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(NUM_JOBS, len(argument_tuples)),
+        mp_context=mp_context,
+        initializer=initialize_pool_worker,
+        initargs=(get_pool_worker_settings(),),
+    ) as pool:
+        futures: list[concurrent.futures.Future] = [
+            pool.submit(call_with_captured_output, function, *arguments)
+            for arguments in argument_tuples
+        ]
+        return [future.result() for future in futures]
+
+
+def count_hot_path(function: Any) -> Any:
+    """
+    Wraps the function so that, when PROFILE_HOT_PATHS is set, its calls and
+    the time spent in it are counted. Time is also attributed to the stack of
+    counted functions the call was made from, excluding time spent in counted
+    functions it calls, so that the stacks can be drawn as a flame graph.
+    """
+    name: str = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*arguments, **keyword_arguments) -> Any:
+        if not PROFILE_HOT_PATHS:
+            return function(*arguments, **keyword_arguments)
+
+        is_recursive: bool = any(frame[0] == name for frame in HOT_PATH_STACK)
+        HOT_PATH_STACK.append([name, 0.0])
+        start_time: float = time.perf_counter()
+
+        try:
+            return function(*arguments, **keyword_arguments)
+        finally:
+            duration: float = time.perf_counter() - start_time
+            stack: str = ";".join(frame[0] for frame in HOT_PATH_STACK)
+            child_duration: float = HOT_PATH_STACK.pop()[1]
+
+            if len(HOT_PATH_STACK) > 0:
+                HOT_PATH_STACK[-1][1] += duration
+
+            HOT_PATH_STACK_TIMES[stack] = (
+                HOT_PATH_STACK_TIMES.get(stack, 0.0) + duration - child_duration
+            )
+            add_to_hot_path_counters(
+                name,
+                calls=1,
+                # Recursive calls are already inside the outer call's time.
+                cumulative_time=0.0 if is_recursive else duration,
+            )
+
+    return wrapper
+
+
+def add_to_hot_path_counters(name: str, **amounts: float) -> None:
+    """
+    Adds the amounts to the hot path's counters: "calls", "cumulative_time",
+    "bytes" parsed, or "lines" parsed.
+    """
+    counters: dict[str, float] = HOT_PATH_COUNTERS.setdefault(
+        name, {"calls": 0, "cumulative_time": 0.0, "bytes": 0, "lines": 0}
+    )
+
+    for counter, amount in amounts.items():
+        counters[counter] += amount
+
+    return
+
+
+def merge_hot_path_counters(
+    counters: dict[str, dict[str, float]], stack_times: dict[str, float]
+) -> None:
+    for name, amounts in counters.items():
+        add_to_hot_path_counters(name, **amounts)
+
+    for stack, duration in stack_times.items():
+        HOT_PATH_STACK_TIMES[stack] = HOT_PATH_STACK_TIMES.get(stack, 0.0) + duration
+
+    return
+
+
+def report_hot_paths(absolute_collapsed_stack_path: str) -> None:
+    """
+    Prints the hot path counters and writes the time spent in each stack of
+    hot paths, in microseconds, as collapsed stacks: one "a;b;c 1234" line per
+    stack, the input format of flame graph tools.
+    """
+    with open(absolute_collapsed_stack_path, "w") as file:
+        for stack, duration in sorted(HOT_PATH_STACK_TIMES.items()):
+            file.write(f"{stack} {round(duration * 1_000_000)}\n")
+
+    if len(HOT_PATH_COUNTERS) == 0:
+        return
+
+    print_empty_line()
+    print("Hot Paths:")
+    print_empty_line()
+    print(f"  {'Function':<41} {'Calls':>7} {'Time (s)':>9} {'Lines':>8} {'KiB':>7}")
+
+    for name, counters in sorted(
+        HOT_PATH_COUNTERS.items(),
+        key=lambda item: item[1]["cumulative_time"],
+        reverse=True,
+    ):
+        print(
+            f"  {name[:41]:<41} {counters['calls']:>7}"
+            + f" {counters['cumulative_time']:>9.3f} {counters['lines']:>8}"
+            + f" {counters['bytes'] / 1024:>7.1f}"
+        )
+
+    return
+
+
+def get_test_identifier(
+    absolute_root_test_directory_path: str, absolute_test_directory_path: str
+) -> str:
+    return os.path.relpath(
+        absolute_test_directory_path, absolute_root_test_directory_path
+    )
+
+
+def write_json_file_if_changed(absolute_filepath: str, contents: Any) -> bool:
+    """
+    Writes contents to the JSON file only if the serialized contents differ
+    from what the file already holds, so unchanged files keep their
+    modification times. The new file replaces the old one atomically.
+
+    Returns True if the file was written.
+    """
+    serialized_contents: str = json.dumps(contents, indent=2)
+    mode: int = 0
+
+    try:
+        with open(absolute_filepath, "r") as file:
+            if file.read() == serialized_contents:
+                return False
+
+            mode = os.fstat(file.fileno()).st_mode
+    except FileNotFoundError:
+        # New files get the permissions open() would give them.
+        umask: int = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+
+    file_descriptor, absolute_temporary_filepath = tempfile.mkstemp(
+        dir=os.path.dirname(absolute_filepath), suffix=".tmp"
+    )
+
+    try:
+        with os.fdopen(file_descriptor, "w") as file:
+            file.write(serialized_contents)
+
+        # mkstemp() creates the file readable by its owner only.
+        os.chmod(absolute_temporary_filepath, stat.S_IMODE(mode))
+        os.replace(absolute_temporary_filepath, absolute_filepath)
+    except BaseException:
+        os.remove(absolute_temporary_filepath)
+        raise
+
+    return True
+
+
+def keep_previous_order(previous: list[str], current: list[str]) -> list[str]:
+    """
+    The dependency tracer returns functions in no particular order. Keeping the
+    previous order when the functions are unchanged avoids rewriting the test
+    information JSON file on every run.
+    """
+    if set(previous) == set(current) and len(previous) == len(current):
+        return previous
+
+    return current
+
+
+def get_test_timeout(test_manifest: dict[str, Any], phase: str) -> float:
+    """
+    Returns the number of seconds a test may spend in a phase ("build" or
+    "execute"). A test can override the defaults with a "timeouts" object in
+    its test_info.json.
+    """
+    default_timeouts: dict[str, float] = {
+        "build": DEFAULT_BUILD_TIMEOUT,
+        "execute": DEFAULT_EXECUTE_TIMEOUT,
+    }
+
+    return float(test_manifest.get("timeouts", {}).get(phase, default_timeouts[phase]))
+
+
+def set_resource_usage_scope(test: Optional[str], phase: Optional[str]) -> None:
+    """
+    Sets the test and phase that the resource usage of subprocesses started
+    from now on is attributed to.
+    """
+    RESOURCE_USAGE_SCOPE["test"] = test
+    RESOURCE_USAGE_SCOPE["phase"] = phase
+    return
+
+
+def record_resource_usage(
+    command: list[str], wall_time: float, return_code: int, rusage: Optional[Any]
+) -> None:
+    """
+    Records the resources a finished subprocess used in RESOURCE_USAGE_RECORDS.
+
+    rusage: The resource usage returned by os.wait4(), or None if it is not
+            available on this platform.
+    """
+    record: dict[str, Any] = {
+        "command": os.path.basename(command[0]),
+        "test": RESOURCE_USAGE_SCOPE["test"],
+        "phase": RESOURCE_USAGE_SCOPE["phase"],
+        "return_code": return_code,
+        "wall_time": wall_time,
+        "user_time": None,
+        "system_time": None,
+        "max_rss_kb": None,
+    }
+
+    if rusage is not None:
+        record["user_time"] = rusage.ru_utime
+        record["system_time"] = rusage.ru_stime
+        # macOS reports the peak resident set size in bytes, not kilobytes.
+        record["max_rss_kb"] = (
+            rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+        )
+
+    RESOURCE_USAGE_RECORDS.append(record)
+    return
+
+
+def wait_for_process(pid: int, timeout: Optional[float]) -> Optional[tuple[int, Any]]:
+    """
+    Waits for the child process to exit and returns its wait status and
+    resource usage, or None if it is still running after timeout seconds.
+    """
+    if timeout is None:
+        _, status, rusage = os.wait4(pid, 0)
+        return (status, rusage)
+
+    deadline: float = time.monotonic() + timeout
+    poll_interval: float = 0.001
+
+    while True:
+        waited_pid, status, rusage = os.wait4(pid, os.WNOHANG)
+
+        if waited_pid == pid:
+            return (status, rusage)
+
+        remaining_time: float = deadline - time.monotonic()
+
+        if remaining_time <= 0:
+            return None
+
+        time.sleep(min(poll_interval, remaining_time))
+        poll_interval = min(poll_interval * 2, 0.05)
+
+
+def kill_process_group(process: subprocess.Popen) -> None:
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        process.kill()
+
+    return
+
+
+def run_subprocess(
+    command: list[str], timeout: Optional[float] = None, **kwargs
+) -> subprocess.CompletedProcess:
+    """
+    Works like subprocess.run(), but starts the command in its own process
+    group and kills the whole group if the command times out, so processes
+    the command spawned (such as the compiler under make) do not linger. The
+    command's resource usage is recorded with record_resource_usage().
+
+    Raises subprocess.TimeoutExpired after the process group is killed.
+    """
+    start_time: float = time.monotonic()
+
+    if not hasattr(os, "wait4"):
+        process: subprocess.Popen = subprocess.Popen(
+            command, start_new_session=True, **kwargs
+        )
+
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill_process_group(process)
+            stdout, stderr = process.communicate()
+            raise subprocess.TimeoutExpired(command, timeout, stdout, stderr)
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            record_resource_usage(
+                command, time.monotonic() - start_time, process.poll(), None
+            )
+
+        return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+    # os.wait4() reaps the process itself, so pipes could not be drained
+    # while waiting; captured output goes to temporary files instead.
+    text: bool = kwargs.pop("text", False)
+    output_files: dict[str, Any] = {}
+
+    for stream in ("stdout", "stderr"):
+        if kwargs.get(stream) == subprocess.PIPE:
+            output_files[stream] = tempfile.TemporaryFile()
+            kwargs[stream] = output_files[stream]
+
+    try:
+        process = subprocess.Popen(command, start_new_session=True, **kwargs)
+
+        try:
+            wait_result: Optional[tuple[int, Any]] = wait_for_process(
+                process.pid, timeout
+            )
+        except BaseException:
+            kill_process_group(process)
+            process.wait()
+            raise
+
+        timed_out: bool = wait_result is None
+
+        if timed_out:
+            kill_process_group(process)
+            wait_result = wait_for_process(process.pid, None)
+
+        status, rusage = wait_result
+        process.returncode = os.waitstatus_to_exitcode(status)
+        record_resource_usage(
+            command, time.monotonic() - start_time, process.returncode, rusage
+        )
+        outputs: dict[str, Optional[Union[str, bytes]]] = {
+            "stdout": None,
+            "stderr": None,
+        }
+
+        for stream, output_file in output_files.items():
+            output_file.seek(0)
+            outputs[stream] = output_file.read()
+
+            if text:
+                outputs[stream] = outputs[stream].decode(errors="replace")
+    finally:
+        for output_file in output_files.values():
+            output_file.close()
+
+    if timed_out:
+        raise subprocess.TimeoutExpired(
+            command, timeout, outputs["stdout"], outputs["stderr"]
+        )
+
+    return subprocess.CompletedProcess(
+        command, process.returncode, outputs["stdout"], outputs["stderr"]
+    )
+
+
+def clean_old_build_files(
+    absolute_test_directory_path: str,
+    absolute_root_test_directory_path: str,
+    timeout: Optional[float] = None,
+) -> None:
+    absolute_log_path: str = get_test_log_path(
+        get_test_identifier(
+            absolute_root_test_directory_path, absolute_test_directory_path
+        ),
+        "clean",
+    )
+
+    try:
+        os.chdir(absolute_test_directory_path)
+
+        with open(absolute_log_path, "w") as log_file:
+            completed_process: subprocess.CompletedProcess = run_subprocess(
+                ["make", "clean"],
+                timeout,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+            )
+
+        print_log_file(absolute_log_path)
+        completed_process.check_returncode()
+        os.chdir(absolute_root_test_directory_path)
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as error:
+        print_empty_line()
+        report_fatal_error_then_exit(
+            error.__str__(), ["Unprecendented failure of make clean. Investigate."]
+        )
+
+    return
+
+
+def build_test_in_debug_mode(
+    absolute_test_directory_path: str,
+    absolute_root_test_directory_path: str,
+    timeout: Optional[float] = None,
+) -> None:
+    absolute_log_path: str = get_test_log_path(
+        get_test_identifier(
+            absolute_root_test_directory_path, absolute_test_directory_path
+        ),
+        "build",
+    )
+
+    try:
+        os.chdir(absolute_test_directory_path)
+        # The capture_output flag will not work here because it prevents
+        # the debug files from being written. The output goes straight to
+        # the log file instead.
+        with open(absolute_log_path, "w") as log_file:
+            completed_process: subprocess.CompletedProcess = run_subprocess(
+                ["make", "debug"],
+                timeout,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+            )
+
+        print_log_file(absolute_log_path)
+        completed_process.check_returncode()
+        os.chdir(absolute_root_test_directory_path)
+    except subprocess.CalledProcessError as error:
+        print_empty_line()
+        report_fatal_error_then_exit(
+            error.__str__(),
+            [
+                "Manually build the test and fix the compiler errors.",
+                f"The compiler output is in '{absolute_log_path}'.",
+            ],
+        )
+    except subprocess.TimeoutExpired as error:
+        print_log_file(absolute_log_path)
+        print_empty_line()
+        report_fatal_error_then_exit(
+            error.__str__(),
+            [
+                "Manually build the test and check whether the build hangs.",
+                "Raise the test's build timeout in its test information JSON file if the build is just slow.",
+            ],
+        )
+
+    return
+
+
+@count_hot_path
+def unmangle_cxx_function_name(name: str, timeout: Optional[float] = None) -> str:
+    """
+    timeout: Seconds c++filt may take. Defaults to DEFAULT_BUILD_TIMEOUT.
+    """
+    if timeout is None:
+        timeout = DEFAULT_BUILD_TIMEOUT
+
+    try:
+        completed_process: subprocess.CompletedProcess = run_subprocess(
+            ["c++filt", "--types", "--strip-underscore", f"{name}"],
+            timeout,
+            stdout=subprocess.PIPE,
+        )
+    except subprocess.TimeoutExpired as error:
+        print_empty_line()
+        report_fatal_error_then_exit(error.__str__())
+
+    if completed_process.returncode != 0:
+        print_empty_line()
+        report_fatal_error_then_exit(
+            subprocess.CalledProcessError(
+                completed_process.returncode, completed_process.args
+            ).__str__()
+        )
+
+    return completed_process.stdout.strip().decode()
+
+
+def remove_ignored_dependencies(
+    dependencies: list[str],
+) -> list[dict[str, (str | list[str])]]:
+    try:
+        ignored_functions = IgnoredFunctions()
+    except FileNotFoundError as error:
+        report_fatal_error_then_exit(
+            error.__str__(),
+            [
+                "The file may not exist.",
+                "The file may not be in the location the testing program expects.",
+                "The file may not have the filename that the testing program expects.",
+            ],
+        )
+
+    final_dependencies: list[str] = []
+
+    for dependency in dependencies:
+        if not ignored_functions.includes(unmangle_cxx_function_name(dependency)):
+            final_dependencies.append(dependency)
+
+    return final_dependencies
+
+
+def estimate_instruction_size(mnemonic: str, operands: list[str]) -> int:
+    """
+    Estimates how many bytes an eZ80 instruction assembles to in ADL mode,
+    from its prefixes, displacement, and immediate or address operand.
+    """
+    operands = [operand.replace(" ", "").lower() for operand in operands]
+    size: int = 1
+
+    # Suffixes such as .sis and .lil add a prefix byte.
+    if "." in mnemonic:
+        mnemonic = mnemonic.split(".")[0]
+        size += 1
+
+    indexed: bool = any(
+        operand.strip("()").startswith(("ix", "iy")) for operand in operands
+    )
+
+    if mnemonic in EZ80_ED_PREFIXED_MNEMONICS:
+        size += 1
+    elif indexed:
+        size += 1
+
+    if mnemonic in EZ80_CB_PREFIXED_MNEMONICS:
+        size += 1
+
+    if mnemonic in ("adc", "sbc") and operands[:1] == ["hl"]:
+        size += 1
+
+    if mnemonic == "ld" and len(operands) == 2:
+        # Loads of a wide register from or to (hl) or an absolute address
+        # other than through hl need the ED prefix.
+        for operand, other_operand in (operands, operands[::-1]):
+            if operand in ("bc", "de", "sp") and (
+                other_operand == "(hl)"
+                or (
+                    other_operand.startswith("(")
+                    and other_operand.strip("()") not in EZ80_REGISTERS
+                )
+            ):
+                size += 1
+            elif operand in ("hl", "ix", "iy") and other_operand == "(hl)":
+                size += 1
+
+    for index, operand in enumerate(operands):
+        register: str = operand.strip("()")
+
+        if register.startswith(("ix+", "ix-", "iy+", "iy-")):
+            size += 1
+        elif register in EZ80_REGISTERS:
+            continue
+        elif (
+            index == 0
+            and mnemonic in ("call", "jp", "jr", "ret")
+            and operand in EZ80_CONDITIONS
+        ):
+            continue
+        elif mnemonic in ("bit", "im", "res", "rst", "set"):
+            # The operand is encoded in the opcode.
+            continue
+        elif mnemonic in ("djnz", "in0", "jr", "out0"):
+            size += 1
+        elif mnemonic in ("call", "jp") or operand.startswith("("):
+            size += 3
+        elif any(other_operand in EZ80_WIDE_REGISTERS for other_operand in operands):
+            size += 3
+        else:
+            size += 1
+
+    return size
+
+
+@count_hot_path
+def extract_all_functions_from_object_file(
+    absolute_filepath: str,
+) -> list[dict[str, (str | list[str] | int)]]:
+    """
+    Returns the functions in the assembly listing with the functions each one
+    calls, how many instructions it has, and an estimate of its size in
+    bytes.
+    """
+    contents: list[str] = []
+    functions: list[dict[str, (str | list[str])]] = []
+
+    with open(absolute_filepath, "rb") as file:
+        contents = file.readlines()
+
+    if PROFILE_HOT_PATHS:
+        add_to_hot_path_counters(
+            extract_all_functions_from_object_file.__qualname__,
+            bytes=sum(len(line) for line in contents),
+            lines=len(contents),
+        )
+
+    index: int = 0
+
+    while index < len(contents):
+        line: str = contents[index]
+
+        if line.startswith(b"__") or line.startswith(b"_main"):
+            mangled_function_name: str = line.strip().rstrip(b":").decode()
+            functions.append(
+                {
+                    "name": mangled_function_name,
+                    "dependencies": [],
+                    "instructions": 0,
+                    "bytes": 0,
+                }
+            )
+
+            while index < len(contents):
+                line = contents[index]
+                fields: list[str] = (
+                    line.split(b";")[0].decode(errors="replace").split(None, 1)
+                )
+
+                if (
+                    line.startswith(b"\t")
+                    and len(fields) > 0
+                    and not fields[0].startswith(".")
+                    and fields[0].lower() not in ASSEMBLER_DIRECTIVES
+                ):
+                    operands: list[str] = []
+
+                    if len(fields) > 1:
+                        operands = [operand.strip() for operand in fields[1].split(",")]
+
+                    functions[-1]["instructions"] += 1
+                    functions[-1]["bytes"] += estimate_instruction_size(
+                        fields[0].lower(), operands
+                    )
+
+                if line.startswith(b"\tcall\t"):
+                    line = line.strip()
+                    function_name_start: int = 0
+
+                    try:
+                        function_name_start = line.rindex(b" ") + 1
+                    except ValueError:
+                        function_name_start = line.rindex(b"\t") + 1
+
+                    line = line[function_name_start:]
+                    mangled_function_name: str = line.decode()
+
+                    if mangled_function_name not in functions[-1]["dependencies"]:
+                        functions[-1]["dependencies"].append(mangled_function_name)
+
+                if b"cfi_endproc" in line:
+                    break
+
+                index += 1
+        else:
+            index += 1
+
+    if PRINT_DEPENDENCY_TRACE_INFO == True:
+        print_empty_line()
+        print(f"All Functions Found In '{os.path.basename(absolute_filepath)}':")
+        print_empty_line()
+        for function in functions:
+            print(
+                unmangle_cxx_function_name(function["name"])
+                + " ("
+                + function["name"]
+                + f", {function['instructions']} instructions"
+                + f", ~{function['bytes']} bytes):"
+            )
+
+            for dependency in function["dependencies"]:
+                print("  ", end="")
+                print_function_name(dependency)
+
+    return functions
+
+
+def extract_functions_test_uses(
+    absolute_filepath: str,
+    functions: Optional[list[dict[str, (str | list[str])]]] = None,
+) -> list[str]:
+    """
+    Merges the dependencies of all static and local functions in the test's
+    main.cpp into the dependencies of the test's main() function.
+
+    absolute_filepath: Absolute file path to the test's main.cpp.src object
+                       file.
+    functions: The functions in the object file, if it was already parsed.
+    """
+    if functions is None:
+        functions = extract_all_functions_from_object_file(absolute_filepath)
+
+    for function in functions:
+        if function["name"] == "_main":
+            main_function = function
+
+        # This prevents the dependency merger from endlessly following
+        # recursive functions.
+        if function["name"] in function["dependencies"]:
+            function["dependencies"].remove(function["name"])
+
+        for other_function in functions:
+            if function["name"] in other_function["dependencies"]:
+                other_function["dependencies"].remove(function["name"])
+                other_function["dependencies"] = set(
+                    other_function["dependencies"] + function["dependencies"]
+                )
+
+    # Sorting keeps the output and test information JSON files the same from
+    # run to run.
+    main_function["dependencies"] = sorted(main_function["dependencies"])
+
+    if PRINT_DEPENDENCY_TRACE_INFO == True:
+        print_empty_line()
+        print("Linked Functions Test Uses:")
+        print_empty_line()
+
+        for dependency in main_function["dependencies"]:
+            print("  ", end="")
+            print_function_name(dependency)
+
+    return main_function["dependencies"]
+
+
+@count_hot_path
+def trace_dependencies(
+    dependencies: list[str], functions: list[dict[str, (str | list[str])]]
+) -> list[str]:
+    trace: list[str] = []
+
+    def trace_dependencies_worker(
+        dependencies: list[str],
+        functions: list[dict[str, (str | list[str])]],
+        trace,
+        count=1,
+    ) -> list[str]:
+        for dependency in dependencies:
+            if PRINT_DEPENDENCY_TRACE_INFO == True:
+                print(("  " * count) + dependency)
+
+            # The if-statement prevents recursive functions making the trace
+            # continue indefinitely.
+            if dependency not in trace:
+                trace.append(dependency)
+                for function in functions:
+                    if dependency == function["name"]:
+                        trace = list(
+                            set(
+                                trace
+                                + list(
+                                    trace_dependencies_worker(
+                                        function["dependencies"],
+                                        functions,
+                                        trace,
+                                        count + 1,
+                                    )
+                                )
+                            )
+                        )
+
+        return trace
+
+    return trace_dependencies_worker(dependencies, functions, trace)
+
+
+def get_main_object_file_path(absolute_test_directory_path: str) -> str:
+    return os.path.join(
+        absolute_test_directory_path, "obj", SOURCE_DIRECTORY_NAME, "main.cpp.src"
+    )
+
+
+def get_linked_object_file_paths(absolute_test_directory_path: str) -> list[str]:
+    """
+    Returns the absolute paths to the object files of the code outside the
+    test that the test links against, in a stable order.
+    """
+    absolute_obj_path: str = os.path.join(absolute_test_directory_path, "obj/_..")
+    absolute_object_file_paths: list[str] = []
+
+    for dirpath, dirnames, filenames in os.walk(absolute_obj_path):
+        dirnames.sort()
+
+        for file in sorted(filenames):
+            if file.endswith(".cpp.src"):
+                absolute_object_file_paths.append(os.path.join(dirpath, file))
+
+    return absolute_object_file_paths
+
+
+def trace_dependencies_for_test(
+    absolute_test_directory_path: str,
+    used_functions: list[str],
+    linked_functions: Optional[list[dict[str, (str | list[str])]]] = None,
+) -> list[str]:
+    """
+    linked_functions: The functions in the test's linked object files, if
+                      they were already parsed.
+    """
+    if linked_functions is None:
+        linked_functions = []
+
+        for absolute_object_file_path in get_linked_object_file_paths(
+            absolute_test_directory_path
+        ):
+            linked_functions += extract_all_functions_from_object_file(
+                absolute_object_file_path
+            )
+
+    if PRINT_DEPENDENCY_TRACE_INFO == True:
+        print_empty_line()
+        print("Tracing Dependencies:")
+        print_empty_line()
+
+    dependencies: list[str] = remove_ignored_dependencies(
+        sorted(trace_dependencies(used_functions, linked_functions))
+    )
+
+    if PRINT_DEPENDENCY_TRACE_INFO == True:
+        print_empty_line()
+        print("Used functions:")
+        print_empty_line()
+
+        for function in used_functions:
+            print("  ", end="")
+            print_function_name(function)
+
+        print_empty_line()
+        print("Used functions and their dependencies (ignored dependencies removed):")
+        print_empty_line()
+
+        for dependency in dependencies:
+            print("  ", end="")
+            print_function_name(dependency)
+
+        print_empty_line()
+
+    return dependencies
+
+
+def measure_target_code_sizes(
+    targets: dict[str, str], functions: list[dict[str, (str | list[str] | int)]]
+) -> dict[str, dict[str, int]]:
+    """
+    Returns the instruction count and estimated size in bytes of each target
+    function, alone and together with every function it traces to. Functions
+    without a listing, such as those in the toolchain's libraries, are not
+    counted.
+
+    targets: Unmangled names of the target functions keyed by mangled name.
+    functions: The parsed functions of the code the test links against.
+    """
+    functions_by_name: dict[str, dict[str, (str | list[str] | int)]] = {}
+    code_sizes: dict[str, dict[str, int]] = {}
+
+    for function in functions:
+        functions_by_name.setdefault(function["name"], function)
+
+    for mangled_function_name, unmangled_function_name in targets.items():
+        if mangled_function_name not in functions_by_name:
+            continue
+
+        traced_functions: list[dict[str, (str | list[str] | int)]] = [
+            functions_by_name[name]
+            for name in sorted(trace_dependencies([mangled_function_name], functions))
+            if name in functions_by_name
+        ]
+        code_sizes[unmangled_function_name] = {
+            "instructions": functions_by_name[mangled_function_name]["instructions"],
+            "bytes": functions_by_name[mangled_function_name]["bytes"],
+            "traced_instructions": sum(
+                function["instructions"] for function in traced_functions
+            ),
+            "traced_bytes": sum(function["bytes"] for function in traced_functions),
+        }
+
+    return code_sizes
+
+
+def load_test_manifest(absolute_test_directory_path: str) -> dict[str, Any]:
+    with open(
+        os.path.join(absolute_test_directory_path, TEST_INFO_JSON_FILENAME), "r"
+    ) as file:
+        return json.load(file)
+
+
+def update_test_info_json(
+    absolute_test_directory_path: str,
+    contents: Optional[dict[str, Any]] = None,
+    parsed_object_files: Optional[dict[str, list[dict[str, (str | list[str])]]]] = None,
+) -> tuple[dict[str, Any], dict[str, dict[str, int]]]:
+    """
+    Traces the functions the test uses and their dependencies, then returns
+    the test's updated manifest and the code sizes of its targets (see
+    measure_target_code_sizes()). The test information JSON file is only
+    rewritten if the manifest changed; the code sizes are not saved in it.
+
+    contents: The test's manifest, if it was already read from its
+              test_info.json.
+    parsed_object_files: The functions in each of the test's object files,
+                         keyed by absolute path, if they were already parsed.
+    """
+    absolute_test_info_json_filepath: str = os.path.join(
+        absolute_test_directory_path, TEST_INFO_JSON_FILENAME
+    )
+    absolute_main_object_file_path: str = get_main_object_file_path(
+        absolute_test_directory_path
+    )
+
+    if parsed_object_files is None:
+        parsed_object_files = {
+            absolute_object_file_path: extract_all_functions_from_object_file(
+                absolute_object_file_path
+            )
+            for absolute_object_file_path in [absolute_main_object_file_path]
+            + get_linked_object_file_paths(absolute_test_directory_path)
+        }
+
+    main_functions: list[dict[str, (str | list[str] | int)]] = parsed_object_files[
+        absolute_main_object_file_path
+    ]
+    linked_functions: list[dict[str, (str | list[str] | int)]] = [
+        function
+        for absolute_object_file_path, functions in parsed_object_files.items()
+        if absolute_object_file_path != absolute_main_object_file_path
+        for function in functions
+    ]
+
+    used_functions: list[dict[str, (str | list[str])]] = remove_ignored_dependencies(
+        extract_functions_test_uses(absolute_main_object_file_path, main_functions)
+    )
+
+    if PRINT_DEPENDENCY_TRACE_INFO == True:
+        print_empty_line()
+        print("Functions Test Uses (ignored dependencies removed):")
+        print_empty_line()
+
+        for function in used_functions:
+            print("  ", end="")
+            print_function_name(function)
+
+    if contents is None:
+        contents = load_test_manifest(absolute_test_directory_path)
+
+    previous_used_functions: list[str] = contents.get("used", [])
+    previous_dependencies: list[str] = contents.get("dependencies", [])
+
+    timeout: float = get_test_timeout(contents, "build")
+    contents["used"] = keep_previous_order(
+        previous_used_functions,
+        [unmangle_cxx_function_name(function, timeout) for function in used_functions],
+    )
+
+    used_functions = trace_dependencies_for_test(
+        absolute_test_directory_path, used_functions, linked_functions
+    )
+
+    contents["dependencies"] = []
+    dependencies = []
+    mangled_function_names: dict[str, str] = {}
+
+    for function in used_functions:
+        unmangled_function_name = unmangle_cxx_function_name(function, timeout)
+        mangled_function_names[unmangled_function_name] = function
+        if unmangled_function_name not in contents["targets"]:
+            contents["dependencies"].append(unmangled_function_name)
+            dependencies.append(function)
+
+    contents["dependencies"] = keep_previous_order(
+        previous_dependencies, contents["dependencies"]
+    )
+
+    code_sizes: dict[str, dict[str, int]] = measure_target_code_sizes(
+        {
+            mangled_function_names[target]: target
+            for target in contents["targets"]
+            if target in mangled_function_names
+        },
+        linked_functions,
+    )
+
+    if write_json_file_if_changed(absolute_test_info_json_filepath, contents):
+        print("Updated test information JSON file.")
+
+    targeted_but_unused_functions: list[dict[str, str]] = [
+        function for function in contents["targets"] if function not in contents["used"]
+    ]
+
+    if len(targeted_but_unused_functions) > 0:
+        report_warning(
+            "Test does not have all of the functions it claims to evaluate.",
+            [
+                "Update the test with code to evaluate the missing functions, or",
+                "Remove the names of the missing functions from the list of functions the test claims to evaluate.",
+            ],
+        )
+
+    return (contents, code_sizes)
+
+
+class ObjectCache:
+    """
+    Content-addressed cache for the assembly listings that the CE toolchain
+    compiles from each test's sources. Tests that share sources through
+    EXTRA_CPPSOURCES have identical translation units, so a listing compiled
+    for one test can be copied into the obj/ directory of the others before
+    make runs, and make will skip compiling it again.
+
+    Each listing is keyed on the compiler version, the compile command (which
+    holds the flags and the debug mode options), and the preprocessed source.
+    The paths in the command and the line markers of the preprocessed source
+    are left out of the key, because they depend on where the test is. A
+    source compiled for tests at different depths, with paths relative to
+    each test or prefixed with its directory, gets the same key.
+    """
+
+    _compiler_versions: dict[str, str] = {}
+    _num_restored_objects: int = 0
+    _num_stored_objects: int = 0
+
+    def __init__(self, absolute_cache_directory_path: str):
+        self._absolute_cache_directory_path = absolute_cache_directory_path
+        os.makedirs(self._absolute_cache_directory_path, exist_ok=True)
+        return
+
+    def _get_compile_commands(
+        self, absolute_test_directory_path: str, timeout: Optional[float] = None
+    ) -> list[list[str]]:
+        """
+        Asks make which commands a full debug build of the test would run and
+        returns the ones that compile a source file into an assembly listing.
+        """
+        try:
+            completed_process: subprocess.CompletedProcess = run_subprocess(
+                ["make", "--dry-run", "--always-make", "debug"],
+                timeout,
+                cwd=absolute_test_directory_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        except subprocess.TimeoutExpired as error:
+            report_warning(f"Not using the object cache: {error}")
+            return []
+
+        if completed_process.returncode != 0:
+            return []
+
+        compile_commands: list[list[str]] = []
+
+        for line in completed_process.stdout.splitlines():
+            try:
+                command: list[str] = shlex.split(line)
+            except ValueError:
+                continue
+
+            if "-S" not in command or "-o" not in command:
+                continue
+
+            output_index: int = command.index("-o") + 1
+
+            if output_index < len(command) and command[output_index].endswith(".src"):
+                compile_commands.append(command)
+
+        return compile_commands
+
+    def _get_compiler_version(
+        self, compiler: str, timeout: Optional[float] = None
+    ) -> str:
+        """
+        Raises subprocess.TimeoutExpired if the compiler does not answer in
+        time.
+        """
+        if compiler not in self._compiler_versions:
+            completed_process: subprocess.CompletedProcess = run_subprocess(
+                [compiler, "--version"],
+                timeout,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+            self._compiler_versions[compiler] = completed_process.stdout
+
+        return self._compiler_versions[compiler]
+
+    def _compute_key(
+        self,
+        absolute_test_directory_path: str,
+        command: list[str],
+        timeout: Optional[float] = None,
+    ) -> Optional[str]:
+        """
+        Returns None if the key could not be computed, in which case the
+        listing is neither restored nor stored.
+        """
+        output_index: int = command.index("-o") + 1
+        preprocess_command: list[str] = []
+        key_arguments: list[str] = []
+        index: int = 0
+
+        # Turn the compile command into one that writes the preprocessed
+        # source, without line markers, to stdout instead of writing a listing
+        # and its dependencies. The key only takes the arguments that do not
+        # name a file or directory.
+        while index < len(command):
+            argument: str = command[index]
+
+            if index == output_index:
+                preprocess_command.append("-")
+            elif argument == "-S":
+                preprocess_command += ["-E", "-P"]
+                key_arguments.append(argument)
+            elif argument in ("-MD", "-MMD"):
+                pass
+            elif argument in ("-MF", "-MT", "-MQ"):
+                index += 1
+            elif argument in INCLUDE_DIRECTORY_OPTIONS:
+                preprocess_command += command[index : index + 2]
+                index += 1
+            elif (
+                argument.startswith(INCLUDE_DIRECTORY_OPTIONS)
+                or os.path.splitext(argument)[1] in SOURCE_FILE_EXTENSIONS
+            ):
+                preprocess_command.append(argument)
+            else:
+                preprocess_command.append(argument)
+                key_arguments.append(argument)
+
+            index += 1
+
+        try:
+            completed_process: subprocess.CompletedProcess = run_subprocess(
+                preprocess_command,
+                timeout,
+                cwd=absolute_test_directory_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+
+            if completed_process.returncode != 0:
+                return None
+
+            compiler_version: str = self._get_compiler_version(command[0], timeout)
+        except subprocess.TimeoutExpired as error:
+            report_warning(f"Not caching '{command[output_index]}': {error}")
+            return None
+
+        key = hashlib.sha256()
+        key.update(compiler_version.encode())
+        key.update(b"\0".join(argument.encode() for argument in key_arguments))
+        key.update(b"\0")
+        key.update(completed_process.stdout)
+        return key.hexdigest()
+
+    def _get_cached_object_path(self, key: str) -> str:
+        return os.path.join(self._absolute_cache_directory_path, key[:2], key + ".src")
+
+    def restore_objects(
+        self, absolute_test_directory_path: str, timeout: Optional[float] = None
+    ) -> dict[str, Any]:
+        """
+        Copies cached listings into the test's obj/ directory for every
+        listing the test is missing.
+
+        Returns the state that store_objects() needs after the build.
+
+        timeout: Seconds each of the toolchain commands the cache runs may
+                 take. A command that times out is killed, and the listings
+                 it concerns are left to make.
+        """
+        compile_commands: list[list[str]] = self._get_compile_commands(
+            absolute_test_directory_path, timeout
+        )
+        modification_times: dict[str, Optional[float]] = {}
+
+        for command in compile_commands:
+            absolute_object_path: str = os.path.join(
+                absolute_test_directory_path, command[command.index("-o") + 1]
+            )
+
+            if not os.path.exists(absolute_object_path):
+                key: Optional[str] = self._compute_key(
+                    absolute_test_directory_path, command, timeout
+                )
+
+                if key is not None and os.path.exists(
+                    self._get_cached_object_path(key)
+                ):
+                    os.makedirs(os.path.dirname(absolute_object_path), exist_ok=True)
+                    shutil.copyfile(
+                        self._get_cached_object_path(key), absolute_object_path
+                    )
+                    self._num_restored_objects += 1
+
+            try:
+                modification_times[absolute_object_path] = os.path.getmtime(
+                    absolute_object_path
+                )
+            except FileNotFoundError:
+                modification_times[absolute_object_path] = None
+
+        return {
+            "compile_commands": compile_commands,
+            "modification_times": modification_times,
+        }
+
+    def store_objects(
+        self,
+        absolute_test_directory_path: str,
+        restore_state: dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Adds every listing that make compiled during the build to the cache.
+        """
+        for command in restore_state["compile_commands"]:
+            absolute_object_path: str = os.path.join(
+                absolute_test_directory_path, command[command.index("-o") + 1]
+            )
+
+            try:
+                modification_time: float = os.path.getmtime(absolute_object_path)
+            except FileNotFoundError:
+                continue
+
+            if (
+                restore_state["modification_times"][absolute_object_path]
+                == modification_time
+            ):
+                continue
+
+            key: Optional[str] = self._compute_key(
+                absolute_test_directory_path, command, timeout
+            )
+
+            if key is None:
+                continue
+
+            absolute_cached_object_path: str = self._get_cached_object_path(key)
+
+            if os.path.exists(absolute_cached_object_path):
+                continue
+
+            os.makedirs(os.path.dirname(absolute_cached_object_path), exist_ok=True)
+            file_descriptor, absolute_temporary_filepath = tempfile.mkstemp(
+                dir=os.path.dirname(absolute_cached_object_path), suffix=".tmp"
+            )
+            os.close(file_descriptor)
+            shutil.copyfile(absolute_object_path, absolute_temporary_filepath)
+            os.replace(absolute_temporary_filepath, absolute_cached_object_path)
+            self._num_stored_objects += 1
+
+        return
+
+    def get_statistics(self) -> tuple[int, int]:
+        return (self._num_restored_objects, self._num_stored_objects)
+
+
+def build_test(
+    absolute_root_test_directory_path: str,
+    absolute_test_directory_path: str,
+    object_cache: Optional[ObjectCache] = None,
+    timeout: Optional[float] = None,
+) -> None:
+
+    test_identifier: str = get_test_identifier(
+        absolute_root_test_directory_path, absolute_test_directory_path
+    )
+    test_header: str = ""
+
+    if CLEAN_THEN_BUILD_TESTS:
+        test_header = f"Cleaning and compiling '{test_identifier}'"
+    else:
+        test_header = f"Compiling '{test_identifier}'"
+
+    print_empty_line()
+    print(test_header)
+    print_subdivider()
+
+    if CLEAN_THEN_BUILD_TESTS:
+        set_resource_usage_scope(test_identifier, "clean")
+        clean_old_build_files(
+            absolute_test_directory_path, absolute_root_test_directory_path, timeout
+        )
+
+    set_resource_usage_scope(test_identifier, "build")
+    restore_state: Optional[dict[str, Any]] = None
+
+    if object_cache is not None:
+        restore_state = object_cache.restore_objects(
+            absolute_test_directory_path, timeout
+        )
+
+    build_test_in_debug_mode(
+        absolute_test_directory_path, absolute_root_test_directory_path, timeout
+    )
+
+    if object_cache is not None:
+        object_cache.store_objects(absolute_test_directory_path, restore_state, timeout)
+
+    print("Compilation successful.")
+
+    return
+
+
+def directory_holds_test(
+    absolute_root_test_directory_path: str, absolute_current_directory_path: str
+) -> bool:
+    directory_contents: list[str] = os.listdir(absolute_current_directory_path)
+    test_identifier: str = get_test_identifier(
+        absolute_root_test_directory_path, absolute_current_directory_path
+    )
+    source_directory_found: bool = False
+    test_info_json_found: bool = False
+    autotest_json_found: bool = False
+    warning_occurred: bool = False
+
+    if TEST_SOURCE_DIRECTORY_NAME in directory_contents:
+        source_directory_found = True
+
+    if TEST_INFO_JSON_FILENAME in directory_contents:
+        test_info_json_found = True
+
+    if AUTOTEST_JSON_FILENAME in directory_contents:
+        autotest_json_found = True
+
+    if source_directory_found or test_info_json_found or autotest_json_found:
+        if not source_directory_found:
+            report_warning(
+                f"'{test_identifier}' does not have a source directory.",
+                ["Create a source directory and add source code to test."],
+            )
+            warning_occurred = True
+
+        if not test_info_json_found:
+            report_warning(
+                f"'{test_identifier}' does not have a JSON file for test information.",
+                ["Create the JSON file for test information in the test directory."],
+            )
+            warning_occurred = True
+
+        if not autotest_json_found:
+            report_warning(
+                f"'{test_identifier}' does not have an autotest JSON file.",
+                ["Add an autotest JSON file to the test directory."],
+            )
+            warning_occurred = True
+
+        if warning_occurred:
+            report_fatal_error_then_exit(
+                "Invalid test directory structure initiated program abort."
+            )
+    else:
+        return False
+
+    return True
+
+
+def build_tests_in_directory(
+    absolute_root_test_directory_path: str,
+    absolute_current_directory_path: Optional[str] = None,
+    test_manifests: Optional[dict[str, dict[str, Any]]] = None,
+    object_cache: Optional[ObjectCache] = None,
+) -> int:
+    """
+    Builds every test under the directory and returns how many were built.
+    The tests are not traced; see trace_built_tests().
+
+    test_manifests: If given, receives each built test's manifest keyed by
+                    the test's absolute directory path, in build order.
+    """
+    if absolute_current_directory_path is None:
+        absolute_current_directory_path = absolute_root_test_directory_path
+
+    directory_contents = os.scandir(absolute_current_directory_path)
+    num_built_tests: int = 0
+
+    # TODO: Randomly shuffle the directory_contents.
+
+    for entry in directory_contents:
+        if entry.is_file():
+            continue
+
+        absolute_subdirectory_path: str = os.path.join(
+            absolute_current_directory_path, entry
+        )
+
+        if directory_holds_test(
+            absolute_root_test_directory_path, absolute_subdirectory_path
+        ):
+            test_identifier: str = get_test_identifier(
+                absolute_root_test_directory_path, absolute_subdirectory_path
+            )
+            test_manifest: dict[str, Any] = load_test_manifest(
+                absolute_subdirectory_path
+            )
+
+            start_time: float = time.monotonic()
+            EVENT_BUS.emit("build_start", test=test_identifier)
+            build_test(
+                absolute_root_test_directory_path,
+                absolute_subdirectory_path,
+                object_cache,
+                get_test_timeout(test_manifest, "build"),
+            )
+            EVENT_BUS.emit(
+                "build_finish",
+                test=test_identifier,
+                duration=time.monotonic() - start_time,
+            )
+
+            if test_manifests is not None:
+                test_manifests[absolute_subdirectory_path] = test_manifest
+
+            num_built_tests += 1
+        else:
+            num_built_tests += build_tests_in_directory(
+                absolute_root_test_directory_path,
+                absolute_subdirectory_path,
+                test_manifests,
+                object_cache,
+            )
+
+    return num_built_tests
+
+
+def trace_built_tests(test_manifests: dict[str, dict[str, Any]]) -> list[str]:
+    """
+    Traces the dependencies of the built tests, updates their manifests, and
+    checks the code size of their targets. The object files of all tests are
+    parsed in a process pool, then the tests are traced in one. Output and
+    events are replayed in test order so that runs stay deterministic.
+
+    Returns the tests that failed their code size check. Code size does not
+    change from one execution to the next, so it is checked once, here.
+
+    test_manifests: Manifests of the built tests, keyed by the test's
+                    absolute directory path.
+    """
+    failed_code_size_tests: list[str] = []
+    absolute_object_file_paths: dict[str, list[str]] = {
+        absolute_test_directory_path: [
+            get_main_object_file_path(absolute_test_directory_path)
+        ]
+        + get_linked_object_file_paths(absolute_test_directory_path)
+        for absolute_test_directory_path in test_manifests
+    }
+    parse_captures: dict[str, dict[str, Any]] = dict(
+        zip(
+            [
+                absolute_object_file_path
+                for paths in absolute_object_file_paths.values()
+                for absolute_object_file_path in paths
+            ],
+            call_in_process_pool(
+                extract_all_functions_from_object_file,
+                [
+                    (absolute_object_file_path,)
+                    for paths in absolute_object_file_paths.values()
+                    for absolute_object_file_path in paths
+                ],
+            ),
+        )
+    )
+
+    for capture in parse_captures.values():
+        if capture["exit_code"] is not None:
+            replay_captured_output(capture)
+
+    trace_captures: list[dict[str, Any]] = call_in_process_pool(
+        update_test_info_json,
+        [
+            (
+                absolute_test_directory_path,
+                test_manifest,
+                {
+                    absolute_object_file_path: parse_captures[
+                        absolute_object_file_path
+                    ]["result"]
+                    for absolute_object_file_path in absolute_object_file_paths[
+                        absolute_test_directory_path
+                    ]
+                },
+            )
+            for absolute_test_directory_path, test_manifest in test_manifests.items()
+        ],
+    )
+
+    for absolute_test_directory_path, trace_capture in zip(
+        list(test_manifests), trace_captures
+    ):
+        test_identifier: str = get_test_identifier(
+            ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, absolute_test_directory_path
+        )
+        test_parse_captures: list[dict[str, Any]] = [
+            parse_captures[absolute_object_file_path]
+            for absolute_object_file_path in absolute_object_file_paths[
+                absolute_test_directory_path
+            ]
+        ]
+
+        print_empty_line()
+        print(f"Tracing '{test_identifier}'")
+        print_subdivider()
+        EVENT_BUS.emit("trace_start", test=test_identifier)
+        set_resource_usage_scope(test_identifier, "trace")
+
+        for capture in test_parse_captures:
+            replay_captured_output(capture)
+
+        test_manifests[absolute_test_directory_path], code_sizes = (
+            replay_captured_output(trace_capture)
+        )
+        EVENT_BUS.emit(
+            "trace_finish",
+            test=test_identifier,
+            duration=trace_capture["duration"]
+            + sum(capture["duration"] for capture in test_parse_captures),
+            dependencies=test_manifests[absolute_test_directory_path]["dependencies"],
+            code_sizes=code_sizes,
+        )
+
+        if not evaluate_code_sizes(
+            absolute_test_directory_path,
+            test_manifests[absolute_test_directory_path],
+            code_sizes,
+        ):
+            EVENT_BUS.emit("code_size_failure", test=test_identifier)
+            failed_code_size_tests.append(test_identifier)
+
+    set_resource_usage_scope(None, None)
+    return failed_code_size_tests
+
+
+def extract_performance_measurements(autotester_output: str) -> dict[str, int]:
+    """
+    Pairs the start and stop markers that the testutil performance timer
+    functions print to the emulator's debug console and returns the elapsed
+    CPU cycles for each label. A label that is timed more than once has its
+    elapsed cycles summed.
+
+    autotester_output: Combined output of one autotester run.
+    """
+    start_timestamps: dict[str, int] = {}
+    measurements: dict[str, int] = {}
+
+    for line in autotester_output.splitlines():
+        marker_start: int = line.find(PERFORMANCE_MARKER_PREFIX + "|")
+
+        if marker_start < 0:
+            continue
+
+        fields: list[str] = line[marker_start:].strip().split("|")
+
+        if len(fields) != 4:
+            report_warning(f"Malformed performance marker '{line.strip()}'.")
+            continue
+
+        label: str = fields[1]
+        marker: str = fields[2]
+
+        try:
+            timestamp: int = int(fields[3])
+        except ValueError:
+            report_warning(f"Malformed performance marker '{line.strip()}'.")
+            continue
+
+        if marker == "start":
+            start_timestamps[label] = timestamp
+        elif marker == "stop" and label in start_timestamps:
+            # The hardware timer is 32 bits wide and may wrap around.
+            elapsed: int = (timestamp - start_timestamps.pop(label)) % (1 << 32)
+            measurements[label] = measurements.get(label, 0) + elapsed
+        else:
+            report_warning(f"Unmatched performance marker '{line.strip()}'.")
+
+    for label in start_timestamps:
+        report_warning(f"Performance timer '{label}' was started but not stopped.")
+
+    return measurements
+
+
+def evaluate_performance_measurements(
+    absolute_test_directory_path: str,
+    contents: dict[str, Any],
+    measurements: dict[str, int],
+) -> bool:
+    """
+    Compares the measurements of one test run against the baselines in the
+    test's manifest and returns False if any measurement regressed by more
+    than the tolerance. Baselines are only recorded, and written to the
+    test's test_info.json, when UPDATE_PERFORMANCE_BASELINES is set.
+
+    contents: The test's manifest, as read from its test_info.json.
+    """
+    absolute_test_info_json_filepath: str = os.path.join(
+        absolute_test_directory_path, TEST_INFO_JSON_FILENAME
+    )
+
+    if "performance" not in contents and len(measurements) == 0:
+        return True
+
+    performance: dict[str, Any] = contents.get("performance", {})
+    tolerance: float = performance.get("tolerance", DEFAULT_PERFORMANCE_TOLERANCE)
+    baselines: dict[str, int] = performance.get("baselines", {})
+    baselines_changed: bool = False
+    passed: bool = True
+
+    if len(measurements) == 0:
+        report_warning(
+            "Performance test did not print any timing markers.",
+            [
+                "Bracket the code under measurement with testutil_StartPerformanceTimer() and testutil_StopPerformanceTimer().",
+                "Make sure the test is built in debug mode so that the markers are printed.",
+            ],
+        )
+        return False
+
+    print_empty_line()
+    print("Performance (CPU cycles):")
+
+    for label, cycles in measurements.items():
+        if UPDATE_PERFORMANCE_BASELINES:
+            print(f"  {label}: {cycles} (baseline recorded)")
+            baselines[label] = cycles
+            baselines_changed = True
+            continue
+
+        if label not in baselines:
+            print(f"  {label}: {cycles} (no baseline)")
+            report_warning(
+                f"Performance timer '{label}' does not have a baseline.",
+                [
+                    "Rerun the tests with --update-performance-baselines to record it."
+                ],
+            )
+            continue
+
+        baseline: int = baselines[label]
+        change: float = (cycles - baseline) / baseline if baseline > 0 else 0.0
+
+        print(f"  {label}: {cycles} (baseline {baseline}, {change:+.1%})")
+
+        if cycles > baseline * (1 + tolerance):
+            report_warning(
+                f"Performance of '{label}' regressed by {change:.1%}, which exceeds the tolerance of {tolerance:.1%}.",
+                [
+                    "Find and fix the cause of the regression, or",
+                    "Rerun the tests with --update-performance-baselines if the regression is expected.",
+                ],
+            )
+            passed = False
+
+    for label in baselines:
+        if label not in measurements:
+            report_warning(
+                f"Performance timer '{label}' has a baseline but no measurement."
+            )
+
+    if baselines_changed:
+        contents["performance"] = performance | {"baselines": baselines}
+        write_json_file_if_changed(absolute_test_info_json_filepath, contents)
+
+    return passed
+
+
+def evaluate_code_sizes(
+    absolute_test_directory_path: str,
+    contents: dict[str, Any],
+    measurements: dict[str, dict[str, int]],
+) -> bool:
+    """
+    Compares the code size of each of the test's targets, alone and with the
+    functions it traces to, against the baselines in the test's information
+    JSON file. Baselines are only recorded, and written to the file, when
+    UPDATE_CODE_SIZE_BASELINES is set.
+
+    Returns False if any target grew by more than the test's tolerance.
+
+    contents: The test's manifest.
+    measurements: The code sizes from the test's trace.
+    """
+    absolute_test_info_json_filepath: str = os.path.join(
+        absolute_test_directory_path, TEST_INFO_JSON_FILENAME
+    )
+    code_size: dict[str, Any] = contents.get("code_size", {})
+
+    if len(measurements) == 0:
+        return True
+
+    tolerance: float = code_size.get("tolerance", DEFAULT_CODE_SIZE_TOLERANCE)
+    baselines: dict[str, dict[str, int]] = code_size.get("baselines", {})
+    baselines_changed: bool = False
+    passed: bool = True
+
+    print_empty_line()
+    print("Code size (estimated bytes, alone / with dependencies):")
+
+    for target, measurement in measurements.items():
+        if UPDATE_CODE_SIZE_BASELINES:
+            print(
+                f"  {target}: {measurement['bytes']} / {measurement['traced_bytes']}"
+                " (baseline recorded)"
+            )
+            baselines[target] = dict(measurement)
+            baselines_changed = True
+            continue
+
+        if target not in baselines:
+            print(
+                f"  {target}: {measurement['bytes']} / {measurement['traced_bytes']}"
+                " (no baseline)"
+            )
+            report_warning(
+                f"Target '{target}' does not have a code size baseline.",
+                ["Rerun the tests with --update-code-size-baselines to record it."],
+            )
+            continue
+
+        baseline: dict[str, int] = baselines[target]
+        changes: dict[str, float] = {
+            field: (
+                (measurement[field] - baseline[field]) / baseline[field]
+                if baseline[field] > 0
+                else 0.0
+            )
+            for field in ("bytes", "traced_bytes")
+        }
+
+        print(
+            f"  {target}: {measurement['bytes']} ({changes['bytes']:+.1%})"
+            f" / {measurement['traced_bytes']} ({changes['traced_bytes']:+.1%})"
+        )
+
+        for field, description in (
+            ("bytes", ""),
+            ("traced_bytes", " with its dependencies"),
+        ):
+            if measurement[field] > baseline[field] * (1 + tolerance):
+                report_warning(
+                    f"Code size of '{target}'{description} grew by {changes[field]:.1%}, which exceeds the tolerance of {tolerance:.1%}.",
+                    [
+                        "Find and remove the cause of the growth, or",
+                        "Rerun the tests with --update-code-size-baselines if the growth is expected.",
+                    ],
+                )
+                passed = False
+
+    for target in baselines:
+        if target not in measurements:
+            report_warning(
+                f"Target '{target}' has a code size baseline but no measurement."
+            )
+
+    if baselines_changed:
+        contents["code_size"] = code_size | {"baselines": baselines}
+        write_json_file_if_changed(absolute_test_info_json_filepath, contents)
+
+    return passed
+
+
+def get_program_file_name(absolute_program_file_path: str) -> Optional[str]:
+    """
+    Returns the name of the program in a variable (.8xp) file, or None if the
+    file does not hold exactly one program.
+    """
+    try:
+        with open(absolute_program_file_path, "rb") as file:
+            data: bytes = file.read()
+    except OSError:
+        return None
+
+    # The data section starts at 0x37 and is followed by a 16-bit checksum.
+    # Its first entry has the variable type at 0x3B and the name at 0x3C.
+    if (
+        len(data) < 0x4A
+        or not data.startswith(b"**TI83F*")
+        or len(data) != 0x37 + int.from_bytes(data[0x35:0x37], "little") + 2
+        or data[0x3B] not in (0x05, 0x06)
+    ):
+        return None
+
+    return data[0x3C:0x44].rstrip(b"\x00").decode("ascii", errors="replace")
+
+
+def write_renamed_program_file(
+    absolute_program_file_path: str,
+    absolute_renamed_program_file_path: str,
+    program_name: str,
+) -> None:
+    """
+    Writes a copy of a program file whose program is called program_name.
+    get_program_file_name() must accept the original file.
+    """
+    with open(absolute_program_file_path, "rb") as file:
+        data: bytearray = bytearray(file.read())
+
+    data[0x3C:0x44] = program_name.encode("ascii").ljust(8, b"\x00")
+    data[-2:] = (sum(data[0x37:-2]) & 0xFFFF).to_bytes(2, "little")
+
+    with open(absolute_renamed_program_file_path, "wb") as file:
+        file.write(data)
+
+    return
+
+
+class TestExecutor:
+    """
+    Executes built tests with the autotester and keeps track of their results.
+    """
+
+    def __init__(self, test_manifests: Optional[dict[str, dict[str, Any]]] = None):
+        """
+        test_manifests: Manifests of the tests, keyed by the test's absolute
+                        directory path. Tests without a manifest have theirs
+                        read from their test_info.json.
+        """
+        self._failed_tests: list[str] = []
+        self._test_results: list[dict[str, Any]] = []
+        self._test_manifests: dict[str, dict[str, Any]] = (
+            test_manifests if test_manifests is not None else {}
+        )
+        return
+
+    def _get_test_manifest(self, absolute_test_directory_path: str) -> dict[str, Any]:
+        if absolute_test_directory_path not in self._test_manifests:
+            self._test_manifests[absolute_test_directory_path] = load_test_manifest(
+                absolute_test_directory_path
+            )
+
+        return self._test_manifests[absolute_test_directory_path]
+
+    def _load_autotest_json_file(
+        self, absolute_test_directory_path: str
+    ) -> dict[str, Any]:
+        with open(
+            os.path.join(absolute_test_directory_path, AUTOTEST_JSON_FILENAME)
+        ) as file:
+            return json.load(file)
+
+    def _write_autotest_json_file_with_rom(
+        self, absolute_test_directory_path: str
+    ) -> str:
+        """
+        Writes a temporary copy of the test's autotest JSON file that points
+        at the testing ROM, so the checked-in file is never modified. The
+        transfer file paths are made absolute because the copy does not live
+        in the test directory.
+
+        Returns the absolute path to the temporary copy.
+        """
+        contents: dict[str, Any] = self._load_autotest_json_file(
+            absolute_test_directory_path
+        )
+
+        contents["rom"] = TESTING_ROM_ABSOLUTE_PATH
+        contents["transfer_files"] = [
+            os.path.join(absolute_test_directory_path, transfer_file)
+            for transfer_file in contents["transfer_files"]
+        ]
+
+        file_descriptor, absolute_autotest_json_path = tempfile.mkstemp(
+            prefix="autotest_", suffix=".json"
+        )
+
+        with os.fdopen(file_descriptor, "w") as file:
+            json.dump(contents, file, indent=2)
+
+        return absolute_autotest_json_path
+
+    def _execute_test_attempt(
+        self, absolute_test_directory_path: str, absolute_log_path: str
+    ) -> tuple[str, Optional[str]]:
+        """
+        Runs the test once and returns its outcome with an error message if
+        it did not pass. The outcome is "passed", "failed" if the autotester
+        reported an error, "timed out", or "regressed" if the test ran but
+        failed its performance check.
+        """
+        test_identifier: str = get_test_identifier(
+            ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, absolute_test_directory_path
+        )
+        test_manifest: dict[str, Any] = self._get_test_manifest(
+            absolute_test_directory_path
+        )
+        timeout: float = get_test_timeout(test_manifest, "execute")
+
+        os.chdir(absolute_test_directory_path)
+        absolute_autotest_json_path: str = self._write_autotest_json_file_with_rom(
+            absolute_test_directory_path
+        )
+
+        # The output is captured so that the performance markers can be read
+        # from it.
+        try:
+            completed_process: subprocess.CompletedProcess = run_subprocess(
+                [AUTOTESTER_COMMAND, absolute_autotest_json_path],
+                timeout,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+            )
+        except subprocess.TimeoutExpired as error:
+            self._append_to_log_file(absolute_log_path, error.stdout or "")
+            return ("timed out", error.__str__())
+        finally:
+            os.remove(absolute_autotest_json_path)
+            os.chdir(ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY)
+
+        self._append_to_log_file(absolute_log_path, completed_process.stdout)
+
+        if completed_process.returncode != 0:
+            return (
+                "failed",
+                subprocess.CalledProcessError(
+                    completed_process.returncode, completed_process.args
+                ).__str__(),
+            )
+
+        if not evaluate_performance_measurements(
+            absolute_test_directory_path,
+            test_manifest,
+            extract_performance_measurements(completed_process.stdout),
+        ):
+            return ("regressed", f"'{test_identifier}' failed its performance check.")
+
+        return ("passed", None)
+
+    def _append_to_log_file(self, absolute_log_path: str, output: str) -> None:
+        with open(absolute_log_path, "a") as file:
+            file.write(output)
+
+        if CONSOLE_MODE == "verbose":
+            sys.stdout.write(output)
+
+        return
+
+    def execute_test(
+        self,
+        absolute_test_directory_path: str,
+        num_retries: Optional[int] = None,
+        first_attempt_number: int = 1,
+    ) -> dict[str, Any]:
+        """
+        Executes the test, retrying it if it fails or times out, and returns
+        its result. Regressions are deterministic, so they are not retried.
+        The result is not recorded; pass it to record_test_result().
+
+        num_retries: How many times to retry the test. Defaults to
+                     NUM_RETRIES.
+        first_attempt_number: Number of the first attempt in the events and
+                              the log, for a test that already had an
+                              attempt in a session.
+        """
+        if num_retries is None:
+            num_retries = NUM_RETRIES
+
+        test_identifier: str = get_test_identifier(
+            ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, absolute_test_directory_path
+        )
+        absolute_log_path: str = get_test_log_path(test_identifier, "execute")
+        attempts: list[dict[str, (str | float)]] = []
+        error_message: Optional[str] = None
+        outcome: str = ""
+
+        set_resource_usage_scope(test_identifier, "execute")
+
+        print_empty_line()
+        print(f"Executing '{test_identifier}':")
+        print_subdivider()
+
+        with open(absolute_log_path, "w"):
+            pass
+
+        for attempt_number in range(
+            first_attempt_number, first_attempt_number + num_retries + 1
+        ):
+            with open(absolute_log_path, "a") as file:
+                file.write(f"--- Attempt {attempt_number} ---\n")
+
+            EVENT_BUS.emit(
+                "execute_start", test=test_identifier, attempt=attempt_number
+            )
+            start_time: float = time.monotonic()
+            outcome, error_message = self._execute_test_attempt(
+                absolute_test_directory_path, absolute_log_path
+            )
+            duration: float = time.monotonic() - start_time
+            EVENT_BUS.emit(
+                "execute_finish",
+                test=test_identifier,
+                attempt=attempt_number,
+                outcome=outcome,
+                duration=duration,
+            )
+
+            attempts.append({"outcome": outcome, "duration": duration})
+            print(f"Attempt {attempt_number} {outcome} in {duration:.2f} s.")
+
+            if outcome not in ("failed", "timed out"):
+                break
+
+        test_result: dict[str, Any] = {
+            "test": test_identifier,
+            "outcome": outcome,
+            "message": error_message,
+            "attempts": attempts,
+            "duration": sum(attempt["duration"] for attempt in attempts),
+            "log": absolute_log_path,
+        }
+        return test_result
+
+    def can_share_session(self, absolute_test_directory_path: str) -> bool:
+        """
+        Returns whether the test can be executed in a session with other
+        tests: its only transfer file is its target program, its sequence
+        launches the program once and never resets the calculator, and it is
+        not a performance test. Output is attributed to the tests of a
+        session by their hash results, which is not reliable enough for
+        timings, so no test shares a session while baselines are recorded.
+        """
+        if UPDATE_PERFORMANCE_BASELINES or "performance" in self._get_test_manifest(
+            absolute_test_directory_path
+        ):
+            return False
+
+        contents: dict[str, Any] = self._load_autotest_json_file(
+            absolute_test_directory_path
+        )
+
+        if (
+            len(contents["transfer_files"]) != 1
+            or get_program_file_name(
+                os.path.join(
+                    absolute_test_directory_path, contents["transfer_files"][0]
+                )
+            )
+            != contents["target"]["name"]
+        ):
+            return False
+
+        for step in contents["sequence"]:
+            command, _, argument = step.partition("|")
+
+            if command == "action" and argument != "launch":
+                return False
+
+            if command in ("hash", "hashWait") and argument not in contents["hashes"]:
+                return False
+
+        return contents["sequence"].count("action|launch") == 1
+
+    def _write_session_autotest_json_file(
+        self,
+        absolute_test_directory_paths: list[str],
+        absolute_session_directory_path: str,
+    ) -> tuple[str, dict[str, int]]:
+        """
+        Writes an autotest JSON file that transfers every test's program under
+        a unique name and runs the tests' sequences one after the other. The
+        first program is launched by the autotester; the others are launched
+        from the program menu. Hash ids are renumbered so that they do not
+        collide.
+
+        Returns the absolute path to the file and, for each renumbered hash
+        id, the index of the test that owns it.
+        """
+        contents: dict[str, Any] = {
+            "rom": TESTING_ROM_ABSOLUTE_PATH,
+            "transfer_files": [],
+            "target": {},
+            "sequence": [],
+            "hashes": {},
+        }
+        hash_owners: dict[str, int] = {}
+
+        for index, (absolute_test_directory_path, program_letter) in enumerate(
+            zip(absolute_test_directory_paths, SESSION_PROGRAM_LAUNCH_KEYS)
+        ):
+            test_identifier: str = get_test_identifier(
+                ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, absolute_test_directory_path
+            )
+            test_contents: dict[str, Any] = self._load_autotest_json_file(
+                absolute_test_directory_path
+            )
+            program_name: str = program_letter + "TEST"
+            absolute_program_file_path: str = os.path.join(
+                absolute_session_directory_path, program_name + ".8xp"
+            )
+            hash_ids: dict[str, str] = {}
+
+            write_renamed_program_file(
+                os.path.join(
+                    absolute_test_directory_path, test_contents["transfer_files"][0]
+                ),
+                absolute_program_file_path,
+                program_name,
+            )
+            contents["transfer_files"].append(absolute_program_file_path)
+
+            if index == 0:
+                contents["target"] = test_contents["target"] | {"name": program_name}
+
+            for original_hash_id, test_hash in test_contents["hashes"].items():
+                hash_id: str = str(len(hash_owners) + 1)
+                hash_ids[original_hash_id] = hash_id
+                hash_owners[hash_id] = index
+                contents["hashes"][hash_id] = test_hash | {
+                    "description": f"{test_identifier}: "
+                    + test_hash.get("description", f"Hash #{original_hash_id}")
+                }
+
+            for step in test_contents["sequence"]:
+                command, _, argument = step.partition("|")
+
+                if step == "action|launch" and index > 0:
+                    contents["sequence"] += [
+                        "key|clear",
+                        "key|prgm",
+                        "key|alpha",
+                        "key|" + SESSION_PROGRAM_LAUNCH_KEYS[program_letter],
+                        "key|enter",
+                        "key|enter",
+                    ]
+                elif command in ("hash", "hashWait"):
+                    contents["sequence"].append(f"{command}|{hash_ids[argument]}")
+                else:
+                    contents["sequence"].append(step)
+
+        absolute_autotest_json_path: str = os.path.join(
+            absolute_session_directory_path, AUTOTEST_JSON_FILENAME
+        )
+
+        with open(absolute_autotest_json_path, "w") as file:
+            json.dump(contents, file, indent=2)
+
+        return (absolute_autotest_json_path, hash_owners)
+
+    def execute_test_session(
+        self, absolute_test_directory_paths: list[str]
+    ) -> list[dict[str, Any]]:
+        """
+        Executes several tests in one autotester run, so that the ROM is
+        booted only once, and returns their results in the given order. A
+        test whose hashes did not all pass in the session, or whose output in
+        the session holds performance timings, is executed again on its own,
+        with retries, to isolate it. The results are not recorded; pass them
+        to record_test_result().
+
+        absolute_test_directory_paths: Independent tests that
+                                       can_share_session() accepts. There may
+                                       be no more of them than there are
+                                       SESSION_PROGRAM_LAUNCH_KEYS.
+        """
+        if len(absolute_test_directory_paths) == 1:
+            return [self.execute_test(absolute_test_directory_paths[0])]
+
+        test_identifiers: list[str] = [
+            get_test_identifier(
+                ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, absolute_test_directory_path
+            )
+            for absolute_test_directory_path in absolute_test_directory_paths
+        ]
+        absolute_session_directory_path: str = tempfile.mkdtemp(
+            prefix="autotest_session_"
+        )
+        timeout: float = sum(
+            get_test_timeout(self._get_test_manifest(path), "execute")
+            for path in absolute_test_directory_paths
+        )
+        output: str = ""
+        return_code: Optional[int] = None
+
+        print_empty_line()
+        print(f"Executing {len(test_identifiers)} tests in one session:")
+
+        for test_identifier in test_identifiers:
+            print(f"  '{test_identifier}'")
+
+        print_subdivider()
+        EVENT_BUS.emit("session_start", tests=test_identifiers)
+
+        for test_identifier in test_identifiers:
+            EVENT_BUS.emit(
+                "execute_start", test=test_identifier, attempt=1, session=True
+            )
+
+        set_resource_usage_scope(None, "execute")
+        num_resource_usage_records: int = len(RESOURCE_USAGE_RECORDS)
+        start_time: float = time.monotonic()
+
+        try:
+            absolute_autotest_json_path, hash_owners = (
+                self._write_session_autotest_json_file(
+                    absolute_test_directory_paths, absolute_session_directory_path
+                )
+            )
+            completed_process: subprocess.CompletedProcess = run_subprocess(
+                [AUTOTESTER_COMMAND, absolute_autotest_json_path],
+                timeout,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+            )
+            output = completed_process.stdout
+            return_code = completed_process.returncode
+        except subprocess.TimeoutExpired as error:
+            output = error.stdout or ""
+        finally:
+            shutil.rmtree(absolute_session_directory_path, ignore_errors=True)
+
+        # The session's time and resources are shared evenly between its
+        # tests.
+        duration: float = (time.monotonic() - start_time) / len(test_identifiers)
+
+        session_records: list[dict[str, Any]] = RESOURCE_USAGE_RECORDS[
+            num_resource_usage_records:
+        ]
+        del RESOURCE_USAGE_RECORDS[num_resource_usage_records:]
+
+        for record in session_records:
+            for test_identifier in test_identifiers:
+                shared_record: dict[str, Any] = record | {
+                    "test": test_identifier,
+                    "shared_by": len(test_identifiers),
+                }
+
+                for field in ("wall_time", "user_time", "system_time"):
+                    if shared_record[field] is not None:
+                        shared_record[field] /= len(test_identifiers)
+
+                RESOURCE_USAGE_RECORDS.append(shared_record)
+        EVENT_BUS.emit(
+            "session_finish", tests=test_identifiers, return_code=return_code
+        )
+
+        if CONSOLE_MODE == "verbose":
+            sys.stdout.write(output)
+
+        # Each line of output is attributed to the test that owns the next
+        # hash result, so a test's debug output ends up in its own log.
+        test_outputs: list[str] = [""] * len(test_identifiers)
+        passed_hash_ids: set[str] = set()
+        pending_lines: list[str] = []
+
+        for line in output.splitlines(keepends=True):
+            pending_lines.append(line)
+            match: Optional[re.Match] = AUTOTESTER_HASH_RESULT_PATTERN.search(line)
+
+            if match is None or match.group(2) not in hash_owners:
+                continue
+
+            if match.group(1).upper() == "OK":
+                passed_hash_ids.add(match.group(2))
+
+            test_outputs[hash_owners[match.group(2)]] += "".join(pending_lines)
+            pending_lines = []
+
+        test_outputs[-1] += "".join(pending_lines)
+        test_results: list[dict[str, Any]] = []
+
+        for index, absolute_test_directory_path in enumerate(
+            absolute_test_directory_paths
+        ):
+            test_identifier: str = test_identifiers[index]
+            absolute_log_path: str = get_test_log_path(test_identifier, "execute")
+            passed: bool = return_code == 0 or all(
+                hash_id in passed_hash_ids
+                for hash_id, owner in hash_owners.items()
+                if owner == index
+            )
+
+            with open(absolute_log_path, "w") as file:
+                file.write(f"--- Session of {len(test_identifiers)} tests ---\n")
+                file.write(test_outputs[index])
+
+            # Performance tests never share a session, so timings in a test's
+            # output come from a test that starts its timers without having
+            # a performance entry yet, and may have been attributed to the
+            # wrong test.
+            outcome: str = "passed"
+            reason: str = ""
+
+            if not passed:
+                outcome = "failed"
+                reason = "did not pass in the session"
+            elif PERFORMANCE_MARKER_PREFIX + "|" in test_outputs[index]:
+                outcome = "inconclusive"
+                reason = "printed performance timings in the session"
+
+            EVENT_BUS.emit(
+                "execute_finish",
+                test=test_identifier,
+                attempt=1,
+                outcome=outcome,
+                duration=duration,
+                session=True,
+            )
+
+            if outcome != "passed":
+                print_empty_line()
+                print(f"'{test_identifier}' {reason}; executing it on its own.")
+                test_result: dict[str, Any] = self.execute_test(
+                    absolute_test_directory_path, first_attempt_number=2
+                )
+                test_result["attempts"].insert(
+                    0, {"outcome": outcome, "duration": duration, "session": True}
+                )
+                test_result["duration"] += duration
+                test_results.append(test_result)
+                continue
+
+            print(f"'{test_identifier}' passed in the session.")
+            test_results.append(
+                {
+                    "test": test_identifier,
+                    "outcome": outcome,
+                    "message": None,
+                    "attempts": [
+                        {"outcome": outcome, "duration": duration, "session": True}
+                    ],
+                    "duration": duration,
+                    "log": absolute_log_path,
+                }
+            )
+
+        return test_results
+
+    def record_test_result(
+        self, test_result: dict[str, Any], abort_on_failure: bool = True
+    ) -> None:
+        """
+        Adds the result of an executed test to the run's results. Aborts
+        testing if the test failed, ABORT_ON_FIRST_FAILED_TEST is set, and
+        abort_on_failure is True.
+        """
+        self._test_results.append(
+            {"test": test_result["test"], "attempts": test_result["attempts"]}
+        )
+        EVENT_BUS.emit("test_result", **test_result)
+
+        if test_result["outcome"] != "passed":
+            self._failed_tests.append(test_result["test"])
+
+            if ABORT_ON_FIRST_FAILED_TEST and abort_on_failure:
+                report_fatal_error_then_exit(test_result["message"])
+
+        return
+
+    def get_test_results(self) -> list[dict[str, Any]]:
+        return self._test_results
+
+    def get_failed_tests(self) -> list[str]:
+        return self._failed_tests
+
+
+class TestBatcher:
+    _batches: list[list[dict[str, (str | list[str])]]] = []
+    _unfulfilled_batch: list[dict[str, (str | list[str])]] = []
+
+    def __init__(
+        self,
+        test_manifests: Optional[dict[str, dict[str, Any]]] = None,
+        batches: Optional[list[list[str]]] = None,
+    ):
+        """
+        test_manifests: Manifests of the tests that were just built, keyed by
+                        the test's absolute directory path. Tests without a
+                        manifest have theirs read from their test_info.json.
+        batches: A precomputed plan, as returned by get_batches(). If given,
+                 the test directory is not searched for tests.
+        """
+        self._test_manifests: dict[str, dict[str, Any]] = (
+            test_manifests if test_manifests is not None else {}
+        )
+
+        if batches is None:
+            self._batch_tests_in_directory(ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY)
+            self._batch_tests_that_have_recursive_dependencies()
+        else:
+            self._batches = [
+                [
+                    {
+                        "path": path,
+                        "targets": self._get_test_manifest(path)["targets"],
+                        "dependencies": [],
+                    }
+                    for path in batch
+                ]
+                for batch in batches
+            ]
+
+        self._executor = TestExecutor(self._test_manifests)
+        return
+
+    @count_hot_path
+    def _batch_test(self, test: dict[str, (str | list[str])], batch_num: int) -> None:
+        if batch_num > len(self._batches):
+            report_fatal_error_then_exit("Unusually high batch number")
+        elif batch_num == len(self._batches):
+            self._batches.append([test])
+        else:
+            self._batches[batch_num].append(test)
+
+        return
+
+    @count_hot_path
+    def _batch_test_as_unfulfilled(self, test: dict[str, (str | list[str])]) -> None:
+        if PRINT_BATCH_BUILDING:
+            print("Unfulfilled test added:", test["path"])
+
+        self._unfulfilled_batch.append(test)
+        return
+
+    @count_hot_path
+    def _evaluate_unfulfilled_batch(
+        self,
+        added_tests: list[dict[str, (str, list[str])]],
+        batch_number_of_added_tests: int,
+    ) -> None:
+        next_set_of_added_tests: list[dict[str, (str, list[str])]] = []
+
+        if PRINT_BATCH_BUILDING:
+            for test in added_tests:
+                print(
+                    ("  " * batch_number_of_added_tests) + "Added test:", test["path"]
+                )
+
+        for added_test in added_tests:
+            for test in self._unfulfilled_batch:
+                if len(test["dependencies"]) == 0:
+                    continue
+
+                test["dependencies"] = list(
+                    set(test["dependencies"]) - set(added_test["targets"])
+                )
+
+                if len(test["dependencies"]) == 0:
+                    if PRINT_BATCH_BUILDING:
+                        print(
+                            ("  " * batch_number_of_added_tests) + "Added:",
+                            test["path"],
+                        )
+
+                    next_set_of_added_tests.append(test)
+                    self._batch_test(test, batch_number_of_added_tests + 1)
+
+        unfulfilled_batch: list[
+            dict[str, (str, list[str])]
+        ] = self._unfulfilled_batch.copy()
+
+        for test in self._unfulfilled_batch:
+            if len(test["dependencies"]) == 0:
+                unfulfilled_batch.remove(test)
+
+        self._unfulfilled_batch = unfulfilled_batch
+
+        if len(next_set_of_added_tests) > 0:
+            self._evaluate_unfulfilled_batch(
+                next_set_of_added_tests, batch_number_of_added_tests + 1
+            )
+
+        return
+
+    def _get_test_manifest(self, absolute_test_directory_path: str) -> dict[str, Any]:
+        if absolute_test_directory_path not in self._test_manifests:
+            self._test_manifests[absolute_test_directory_path] = load_test_manifest(
+                absolute_test_directory_path
+            )
+
+        return self._test_manifests[absolute_test_directory_path]
+
+    @count_hot_path
+    def _assign_test_to_batch(self, absolute_test_directory_path: str) -> None:
+        contents: dict[str, Any] = self._get_test_manifest(
+            absolute_test_directory_path
+        )
+
+        test: dict[str, (str | list[str])] = {}
+        test["path"] = absolute_test_directory_path
+        test["targets"] = list(contents["targets"])
+        test["dependencies"] = list(contents["dependencies"])
+        batch_number: Optional[int] = None
+
+        if len(test["dependencies"]) == 0:
+            batch_number = 0
+        else:
+            for index, batch in enumerate(self._batches):
+                for batch_test in batch:
+                    test["dependencies"] = list(
+                        set(test["dependencies"]) - set(batch_test["targets"])
+                    )
+
+                    if len(test["dependencies"]) == 0:
+                        batch_number = index + 1
+                        break
+
+                if batch_number is not None:
+                    break
+
+        if batch_number is None:
+            self._batch_test_as_unfulfilled(test)
+        else:
+            self._batch_test(test, batch_number)
+            self._evaluate_unfulfilled_batch([test], batch_number)
+        return
+
+    @count_hot_path
+    def _batch_tests_in_directory(self, absolute_directory_path: str) -> None:
+        directory_contents = os.scandir(absolute_directory_path)
+
+        for entry in directory_contents:
+            if entry.is_file():
+                continue
+
+            absolute_subdirectory_path: str = os.path.join(
+                absolute_directory_path, entry
+            )
+
+            if directory_holds_test(
+                ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, absolute_subdirectory_path
+            ):
+                self._assign_test_to_batch(absolute_subdirectory_path)
+            else:
+                self._batch_tests_in_directory(absolute_subdirectory_path)
+
+        return
+
+    @count_hot_path
+    def _batch_tests_that_have_recursive_dependencies(self) -> None:
+        if len(self._unfulfilled_batch) == 0:
+            return
+
+        total_targets: list[str] = []
+
+        for test in self._unfulfilled_batch:
+            total_targets += test["targets"]
+
+        for test in self._unfulfilled_batch:
+            if len(set(test["dependencies"]) - set(total_targets)) > 0:
+                total_targets = list(set(total_targets) - set(test["dependencies"]))
+
+        unfulfilled_batch: list[
+            dict[str, (str | list[str])]
+        ] = self._unfulfilled_batch.copy()
+        final_batch_number: int = len(self._batches)
+
+        for test in self._unfulfilled_batch:
+            test_identifier: str = get_test_identifier(
+                ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, test["path"]
+            )
+            count: int = 1
+
+            if len(set(test["dependencies"]) - set(total_targets)) == 0:
+                self._batch_test(test, final_batch_number)
+                unfulfilled_batch.remove(test)
+            else:
+                print_empty_line()
+                print(
+                    "Untested Dependencies For '"
+                    + get_test_identifier(
+                        ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, test["path"]
+                    )
+                    + "':"
+                )
+
+                for dependency in test["dependencies"]:
+                    print(f"  {count}. " + dependency)
+                    count += 1
+
+        self._unfulfilled_batch = unfulfilled_batch
+
+        if PRINT_BATCH_BUILDING:
+            print_empty_line()
+
+            for index, batch in enumerate(self._batches):
+                print(f"Batch {index + 1}:")
+                for test in batch:
+                    test_identifier: str = get_test_identifier(
+                        ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, test["path"]
+                    )
+                    print("  " + test_identifier)
 
+                print_empty_line()
 
-def get_test_identifier(
-    absolute_root_test_directory_path: str, absolute_test_directory_path: str
-) -> str:
-    return os.path.relpath(
-        absolute_test_directory_path, absolute_root_test_directory_path
-    )
+            print("Unfulfilled Batch:")
 
+            for test in self._unfulfilled_batch:
+                test_identifier: str = get_test_identifier(
+                    ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, test["path"]
+                )
+                print("  " + test_identifier)
+
+        if len(self._unfulfilled_batch) == 0:
+            return
 
-def clean_old_build_files(
-    absolute_test_directory_path: str, absolute_root_test_directory_path: str
-) -> None:
-    try:
-        os.chdir(absolute_test_directory_path)
-        subprocess.run(["make", "clean"], check=True)
-        os.chdir(absolute_root_test_directory_path)
-    except subprocess.CalledProcessError as error:
-        print_empty_line()
         report_fatal_error_then_exit(
-            error.__str__(), ["Unprecendented failure of make clean. Investigate."]
+            "Some tests have untested dependencies.",
+            [
+                "Review the list of tests above and add tests whose targets evaluate the dependency functions listed.",
+                "Make sure that the targets of your existing tests have the correct function signatures.",
+            ],
         )
+        return
 
-    return
+    def get_batches(self) -> list[list[str]]:
+        """
+        Returns the absolute directory paths of the tests in each batch, in
+        the order the batches must run.
+        """
+        return [[test["path"] for test in batch] for batch in self._batches]
 
+    def get_test_manifests(self) -> dict[str, dict[str, Any]]:
+        return self._test_manifests
+
+    def get_executor(self) -> TestExecutor:
+        return self._executor
+
+    def get_test_results(self) -> list[dict[str, Any]]:
+        return self._executor.get_test_results()
+
+    def get_failed_tests(self) -> list[str]:
+        return self._executor.get_failed_tests()
+
+    def run_tests(self) -> int:
+        num_tests_executed: int = 0
+
+        EVENT_BUS.emit(
+            "phase_start",
+            phase="execute",
+            total=sum(len(batch) for batch in self._batches),
+        )
+
+        for batch in self._batches:
+
+            # TODO: Randomly shuffle the tests in each batch.
+
+            for session in self._get_sessions(batch):
+                for test_result in self._executor.execute_test_session(session):
+                    self._executor.record_test_result(test_result)
+                    num_tests_executed += 1
+
+        return num_tests_executed
+
+    def _get_sessions(
+        self, batch: list[dict[str, (str | list[str])]]
+    ) -> list[list[str]]:
+        """
+        Groups the tests in a batch into emulator sessions of at most
+        SESSION_SIZE tests. Tests that cannot share a session get their own.
+        """
+        session_size: int = min(SESSION_SIZE, len(SESSION_PROGRAM_LAUNCH_KEYS))
+        sessions: list[list[str]] = []
+        shared_session: list[str] = []
+
+        for test in batch:
+            if session_size < 2 or not self._executor.can_share_session(test["path"]):
+                sessions.append([test["path"]])
+                continue
+
+            shared_session.append(test["path"])
+
+            if len(shared_session) == session_size:
+                sessions.append(shared_session)
+                shared_session = []
+
+        if len(shared_session) > 0:
+            sessions.append(shared_session)
+
+        return sessions
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    host, _, port = address.rpartition(":")
 
-def build_test_in_debug_mode(
-    absolute_test_directory_path: str, absolute_root_test_directory_path: str
-) -> None:
     try:
-        os.chdir(absolute_test_directory_path)
-        # The capture_output flag will not work here because it prevents
-        # the debug files from being written.
-        subprocess.run(["make", "debug"], check=True)
-        os.chdir(absolute_root_test_directory_path)
-    except subprocess.CalledProcessError as error:
-        print_empty_line()
+        return (host or "127.0.0.1", int(port))
+    except ValueError:
         report_fatal_error_then_exit(
-            error.__str__(), ["Manually build the test and fix the compiler errors."]
+            f"'{address}' is not a valid address.",
+            ["Give the address as HOST:PORT, for example 127.0.0.1:7473."],
         )
 
+
+def send_message(stream: Any, message: dict[str, Any]) -> None:
+    """
+    Coordinators and workers exchange one JSON object per line.
+    """
+    stream.write(json.dumps(message) + "\n")
+    stream.flush()
     return
 
 
-def unmangle_cxx_function_name(name: str) -> str:
-    output: str = ""
+def receive_message(stream: Any) -> Optional[dict[str, Any]]:
+    """
+    Returns None if the other end closed the connection.
+    """
+    line: str = stream.readline()
 
-    try:
-        output = subprocess.check_output(
-            ["c++filt", "--types", "--strip-underscore", f"{name}"]
-        )
-    except subprocess.CalledProcessError as error:
-        print_empty_line()
-        report_fatal_error_then_exit(error.__str__())
+    if line == "":
+        return None
 
-    return output.strip().decode()
+    return json.loads(line)
 
 
-def remove_ignored_dependencies(
-    dependencies: list[str],
-) -> list[dict[str, (str | list[str])]]:
-    try:
-        ignored_functions = IgnoredFunctions()
-    except FileNotFoundError as error:
-        report_fatal_error_then_exit(
-            error.__str__(),
+class TestCoordinator:
+    """
+    Hands the tests of a batch plan to workers one at a time. A worker asks
+    for a test, receives a lease on it, executes it and sends back the
+    result. The tests of a batch are only handed out once every test in the
+    batches before it has a result. If a worker disconnects or holds a lease
+    for longer than the test could take, the lease is revoked and the test
+    goes back to the front of the queue. Performance baselines that a worker
+    records are saved to the coordinator's copy of the test.
+    """
+
+    def __init__(self, batcher: TestBatcher):
+        self._batches: list[list[str]] = [
             [
-                "The file may not exist.",
-                "The file may not be in the location the testing program expects.",
-                "The file may not have the filename that the testing program expects.",
-            ],
+                get_test_identifier(ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, path)
+                for path in batch
+            ]
+            for batch in batcher.get_batches()
+        ]
+        self._test_manifests: dict[str, dict[str, Any]] = batcher.get_test_manifests()
+        self._executor: TestExecutor = batcher.get_executor()
+        self._batch_index: int = -1
+        self._ready_tests: list[str] = []
+        self._leases: dict[int, dict[str, Any]] = {}
+        self._completed_tests: set[str] = set()
+        self._next_lease_id: int = 1
+        self._num_connected_workers: int = 0
+        self._abort_message: Optional[str] = None
+        self._condition = threading.Condition()
+        self._advance_batches()
+        return
+
+    def _advance_batches(self) -> None:
+        while self._batch_index < len(self._batches) and len(self._ready_tests) == 0:
+            if self._batch_index >= 0 and not set(
+                self._batches[self._batch_index]
+            ).issubset(self._completed_tests):
+                return
+
+            self._batch_index += 1
+
+            if self._batch_index < len(self._batches):
+                self._ready_tests = list(self._batches[self._batch_index])
+
+        return
+
+    def _get_lease_duration(self, test_identifier: str) -> float:
+        test_manifest: dict[str, Any] = self._test_manifests.get(
+            os.path.join(ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, test_identifier), {}
         )
 
-    final_dependencies: list[str] = []
+        return get_test_timeout(test_manifest, "execute") * (NUM_RETRIES + 1) + 30.0
 
-    for dependency in dependencies:
-        if not ignored_functions.includes(unmangle_cxx_function_name(dependency)):
-            final_dependencies.append(dependency)
+    def _revoke_lease(self, lease_id: int, reason: str) -> None:
+        lease: dict[str, Any] = self._leases.pop(lease_id)
 
-    return final_dependencies
+        if lease["test"] not in self._completed_tests:
+            report_warning(
+                f"Requeued '{lease['test']}' because {lease['worker']} {reason}."
+            )
+            self._ready_tests.insert(0, lease["test"])
 
+        return
 
-def extract_all_functions_from_object_file(
-    absolute_filepath: str,
-) -> list[dict[str, (str | list[str])]]:
-    contents: list[str] = []
-    functions: list[dict[str, (str | list[str])]] = []
+    def _revoke_expired_leases(self) -> None:
+        now: float = time.monotonic()
 
-    with open(absolute_filepath, "rb") as file:
-        contents = file.readlines()
+        for lease_id, lease in list(self._leases.items()):
+            if lease["deadline"] < now:
+                self._revoke_lease(lease_id, "did not report a result in time")
 
-    index: int = 0
+        return
 
-    while index < len(contents):
-        line: str = contents[index]
+    def _save_performance_baselines(
+        self, test_identifier: str, baselines: dict[str, int]
+    ) -> None:
+        """
+        Writes the performance baselines a worker recorded for the test to
+        the test's test_info.json in the coordinator's copy of the project.
+        """
+        absolute_test_directory_path: str = os.path.join(
+            ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, test_identifier
+        )
 
-        if line.startswith(b"__") or line.startswith(b"_main"):
-            mangled_function_name: str = line.strip().rstrip(b":").decode()
-            functions.append(
-                {
-                    "name": mangled_function_name,
-                    "dependencies": [],
-                }
+        if absolute_test_directory_path not in self._test_manifests:
+            self._test_manifests[absolute_test_directory_path] = load_test_manifest(
+                absolute_test_directory_path
             )
 
-            while index < len(contents):
-                line = contents[index]
+        contents: dict[str, Any] = self._test_manifests[absolute_test_directory_path]
+        performance: dict[str, Any] = contents.get("performance", {})
+        contents["performance"] = performance | {
+            "baselines": performance.get("baselines", {}) | baselines
+        }
 
-                if line.startswith(b"\tcall\t"):
-                    line = line.strip()
-                    function_name_start: int = 0
+        if write_json_file_if_changed(
+            os.path.join(absolute_test_directory_path, TEST_INFO_JSON_FILENAME),
+            contents,
+        ):
+            print("Saved the performance baselines recorded by the worker.")
 
-                    try:
-                        function_name_start = line.rindex(b" ") + 1
-                    except ValueError:
-                        function_name_start = line.rindex(b"\t") + 1
+        return
 
-                    line = line[function_name_start:]
-                    mangled_function_name: str = line.decode()
+    def is_finished(self) -> bool:
+        return self._abort_message is not None or self._batch_index >= len(
+            self._batches
+        )
 
-                    if mangled_function_name not in functions[-1]["dependencies"]:
-                        functions[-1]["dependencies"].append(mangled_function_name)
+    def connect_worker(self, worker: str) -> None:
+        with self._condition:
+            self._num_connected_workers += 1
+            print(f"Worker {worker} connected.")
 
-                if b"cfi_endproc" in line:
-                    break
+        return
 
-                index += 1
-        else:
-            index += 1
+    def disconnect_worker(self, worker: str) -> None:
+        with self._condition:
+            self._num_connected_workers -= 1
 
-    if PRINT_DEPENDENCY_TRACE_INFO == True:
-        print_empty_line()
-        print(f"All Functions Found In '{os.path.basename(absolute_filepath)}':")
-        print_empty_line()
-        for function in functions:
-            print(
-                unmangle_cxx_function_name(function["name"])
-                + " ("
-                + function["name"]
-                + "):"
+            for lease_id, lease in list(self._leases.items()):
+                if lease["worker"] == worker:
+                    self._revoke_lease(lease_id, "disconnected")
+
+            self._condition.notify_all()
+
+        return
+
+    def lease_next_test(self, worker: str) -> dict[str, Any]:
+        with self._condition:
+            self._revoke_expired_leases()
+
+            if self.is_finished():
+                return {"type": "done"}
+
+            if len(self._ready_tests) == 0:
+                return {"type": "wait", "seconds": 0.5}
+
+            test_identifier: str = self._ready_tests.pop(0)
+            lease_id: int = self._next_lease_id
+            self._next_lease_id += 1
+            self._leases[lease_id] = {
+                "test": test_identifier,
+                "worker": worker,
+                "deadline": time.monotonic()
+                + self._get_lease_duration(test_identifier),
+            }
+
+            EVENT_BUS.emit("execute_start", test=test_identifier, worker=worker)
+            return {
+                "type": "test",
+                "lease": lease_id,
+                "test": test_identifier,
+                "retries": NUM_RETRIES,
+            }
+
+    def complete_lease(self, lease_id: int, test_result: dict[str, Any]) -> None:
+        with self._condition:
+            lease: Optional[dict[str, Any]] = self._leases.pop(lease_id, None)
+
+            # A result for a revoked lease is dropped, because the test was
+            # already handed to another worker.
+            if lease is None or lease["test"] in self._completed_tests:
+                return
+
+            test_identifier: str = lease["test"]
+            absolute_log_path: str = get_test_log_path(test_identifier, "execute")
+
+            with open(absolute_log_path, "w") as file:
+                file.write(test_result.pop("output", ""))
+
+            test_result["log"] = absolute_log_path
+            test_result["worker"] = lease["worker"]
+            performance_baselines: Optional[dict[str, int]] = test_result.pop(
+                "performance_baselines", None
             )
 
-            for dependency in function["dependencies"]:
-                print("  ", end="")
-                print_function_name(dependency)
+            print_empty_line()
+            print(f"Executed '{test_identifier}' on {lease['worker']}:")
+            print_subdivider()
+            print_log_file(absolute_log_path)
 
-    return functions
+            for attempt_number, attempt in enumerate(test_result["attempts"], start=1):
+                print(
+                    f"Attempt {attempt_number} {attempt['outcome']} in {attempt['duration']:.2f} s."
+                )
 
+            if performance_baselines is not None:
+                self._save_performance_baselines(test_identifier, performance_baselines)
 
-def extract_functions_test_uses(absolute_filepath: str) -> list[str]:
-    """
-    Merges the dependencies of all static and local functions in the test's
-    main.cpp into the dependencies of the test's main() function.
+            self._completed_tests.add(test_identifier)
+            self._executor.record_test_result(test_result, abort_on_failure=False)
 
-    absolute_filepath: Absolute file path to the test's main.cpp.src object
-                       file.
-    """
-    functions: list[
-        dict[str, (str | list[str])]
-    ] = extract_all_functions_from_object_file(absolute_filepath)
+            if test_result["outcome"] != "passed" and ABORT_ON_FIRST_FAILED_TEST:
+                self._abort_message = test_result["message"]
 
-    for function in functions:
-        if function["name"] == "_main":
-            main_function = function
+            self._advance_batches()
+            self._condition.notify_all()
 
-        # This prevents the dependency merger from endlessly following
-        # recursive functions.
-        if function["name"] in function["dependencies"]:
-            function["dependencies"].remove(function["name"])
+        return
 
-        for other_function in functions:
-            if function["name"] in other_function["dependencies"]:
-                other_function["dependencies"].remove(function["name"])
-                other_function["dependencies"] = set(
-                    other_function["dependencies"] + function["dependencies"]
-                )
+    def wait_until_finished(self, grace_period: float = 5.0) -> Optional[str]:
+        """
+        Blocks until every test has a result, then gives the connected
+        workers a moment to learn that testing is done.
 
-    if PRINT_DEPENDENCY_TRACE_INFO == True:
-        print_empty_line()
-        print("Linked Functions Test Uses:")
-        print_empty_line()
+        Returns the error message of the failed test if testing was aborted.
+        """
+        with self._condition:
+            while not self.is_finished():
+                self._condition.wait(timeout=1.0)
+                self._revoke_expired_leases()
 
-        for dependency in main_function["dependencies"]:
-            print("  ", end="")
-            print_function_name(dependency)
+            deadline: float = time.monotonic() + grace_period
 
-    return main_function["dependencies"]
+            while self._num_connected_workers > 0 and time.monotonic() < deadline:
+                self._condition.wait(timeout=0.1)
 
+        return self._abort_message
 
-def trace_dependencies(
-    dependencies: list[str], functions: list[dict[str, (str | list[str])]]
-) -> list[str]:
-    trace: list[str] = []
+    def get_num_completed_tests(self) -> int:
+        return len(self._completed_tests)
 
-    def trace_dependencies_worker(
-        dependencies: list[str],
-        functions: list[dict[str, (str | list[str])]],
-        trace,
-        count=1,
-    ) -> list[str]:
-        for dependency in dependencies:
-            if PRINT_DEPENDENCY_TRACE_INFO == True:
-                print(("  " * count) + dependency)
 
-            # The if-statement prevents recursive functions making the trace
-            # continue indefinitely.
-            if dependency not in trace:
-                trace.append(dependency)
-                for function in functions:
-                    if dependency == function["name"]:
-                        trace = list(
-                            set(
-                                trace
-                                + list(
-                                    trace_dependencies_worker(
-                                        function["dependencies"],
-                                        functions,
-                                        trace,
-                                        count + 1,
-                                    )
-                                )
-                            )
-                        )
+class TestCoordinatorRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        coordinator: TestCoordinator = self.server.coordinator
+        worker: str = f"{self.client_address[0]}:{self.client_address[1]}"
+        connected: bool = False
+
+        try:
+            while True:
+                message: Optional[dict[str, Any]] = receive_message(self.rfile)
+
+                if message is None:
+                    break
+
+                if message["type"] == "hello":
+                    worker = f"'{message['worker']}' ({worker})"
+                    coordinator.connect_worker(worker)
+                    connected = True
+                elif message["type"] == "request":
+                    self._send(coordinator.lease_next_test(worker))
+                elif message["type"] == "result":
+                    coordinator.complete_lease(message["lease"], message["result"])
+                    self._send({"type": "ack"})
+        except (ConnectionError, json.JSONDecodeError, KeyError):
+            pass
+        finally:
+            if connected:
+                coordinator.disconnect_worker(worker)
+
+        return
 
-        return trace
+    def _send(self, message: dict[str, Any]) -> None:
+        self.wfile.write((json.dumps(message) + "\n").encode())
+        self.wfile.flush()
+        return
 
-    return trace_dependencies_worker(dependencies, functions, trace)
 
+def coordinate_tests(batcher: TestBatcher, address: tuple[str, int]) -> int:
+    """
+    Serves the batcher's plan to workers until every test has a result and
+    returns how many tests were executed.
+    """
+    coordinator = TestCoordinator(batcher)
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    server = socketserver.ThreadingTCPServer(address, TestCoordinatorRequestHandler)
+    server.daemon_threads = True
+    server.coordinator = coordinator
+
+    EVENT_BUS.emit(
+        "phase_start",
+        phase="execute",
+        total=sum(len(batch) for batch in batcher.get_batches()),
+    )
+    print(
+        f"Waiting for workers on {server.server_address[0]}:{server.server_address[1]}."
+    )
 
-def trace_dependencies_for_test(
-    absolute_test_directory_path: str, used_functions: list[str]
-) -> list[str]:
-    linked_functions: list[dict[str, (str | list[str])]] = []
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
 
-    absolute_obj_path: str = os.path.join(absolute_test_directory_path, "obj/_..")
+    abort_message: Optional[str] = coordinator.wait_until_finished()
 
-    for dirpath, dirnames, filenames in os.walk(absolute_obj_path):
-        for file in filenames:
-            if file.endswith(".cpp.src"):
-                linked_functions += extract_all_functions_from_object_file(
-                    os.path.join(dirpath, file)
-                )
+    server.shutdown()
+    server.server_close()
 
-    if PRINT_DEPENDENCY_TRACE_INFO == True:
-        print_empty_line()
-        print("Tracing Dependencies:")
-        print_empty_line()
+    if abort_message is not None:
+        report_fatal_error_then_exit(abort_message)
 
-    dependencies: list[str] = remove_ignored_dependencies(
-        trace_dependencies(used_functions, linked_functions)
-    )
+    return coordinator.get_num_completed_tests()
 
-    if PRINT_DEPENDENCY_TRACE_INFO == True:
-        print_empty_line()
-        print("Used functions:")
-        print_empty_line()
 
-        for function in used_functions:
-            print("  ", end="")
-            print_function_name(function)
+def run_worker(address: tuple[str, int], connect_timeout: float = 600.0) -> int:
+    """
+    Executes tests that the coordinator at the address hands out until it
+    reports that testing is done, and returns how many tests were executed.
+    The tests must already be built in this worker's copy of the project, or
+    be taken from a bundle.
+    """
+    executor = TestExecutor()
+    worker: str = f"{socket.gethostname()}:{os.getpid()}"
+    num_tests_executed: int = 0
+    deadline: float = time.monotonic() + connect_timeout
 
-        print_empty_line()
-        print("Used functions and their dependencies (ignored dependencies removed):")
-        print_empty_line()
+    # The coordinator only starts listening once it has built the tests.
+    while True:
+        try:
+            connection: socket.socket = socket.create_connection(address)
+            break
+        except OSError as error:
+            if time.monotonic() > deadline:
+                report_fatal_error_then_exit(
+                    f"Could not connect to the coordinator: {error}",
+                    ["Make sure the coordinator is running and reachable."],
+                )
 
-        for dependency in dependencies:
-            print("  ", end="")
-            print_function_name(dependency)
+            time.sleep(1.0)
 
-        print_empty_line()
+    with connection, connection.makefile("rw") as stream:
+        send_message(stream, {"type": "hello", "worker": worker})
 
-    return dependencies
+        while True:
+            send_message(stream, {"type": "request"})
+            reply: Optional[dict[str, Any]] = receive_message(stream)
 
+            if reply is None:
+                report_fatal_error_then_exit("The coordinator closed the connection.")
 
-def update_test_info_json(absolute_test_directory_path: str) -> None:
-    absolute_test_info_json_filepath: str = os.path.join(
-        absolute_test_directory_path, TEST_INFO_JSON_FILENAME
-    )
-    contents: list[str] = []
+            if reply["type"] == "done":
+                break
 
-    used_functions: list[dict[str, (str | list[str])]] = remove_ignored_dependencies(
-        extract_functions_test_uses(
-            os.path.join(
-                absolute_test_directory_path,
-                "obj",
-                SOURCE_DIRECTORY_NAME,
-                "main.cpp.src",
+            if reply["type"] == "wait":
+                time.sleep(reply["seconds"])
+                continue
+
+            absolute_test_directory_path: str = os.path.join(
+                ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, reply["test"]
+            )
+            test_result: dict[str, Any] = executor.execute_test(
+                absolute_test_directory_path, reply["retries"]
             )
-        )
-    )
 
-    if PRINT_DEPENDENCY_TRACE_INFO == True:
-        print_empty_line()
-        print("Functions Test Uses (ignored dependencies removed):")
-        print_empty_line()
+            with open(test_result["log"], "r", errors="replace") as file:
+                test_result["output"] = file.read()
 
-        for function in used_functions:
-            print("  ", end="")
-            print_function_name(function)
+            # Baselines are recorded in this worker's copy of the test, so
+            # they are sent along for the coordinator to save.
+            if UPDATE_PERFORMANCE_BASELINES:
+                test_manifest: dict[str, Any] = load_test_manifest(
+                    absolute_test_directory_path
+                )
 
-    with open(absolute_test_info_json_filepath, "r") as file:
-        contents = json.load(file)
+                if "performance" in test_manifest:
+                    test_result["performance_baselines"] = test_manifest[
+                        "performance"
+                    ].get("baselines", {})
 
-    contents["used"] = [
-        unmangle_cxx_function_name(function) for function in used_functions
-    ]
+            send_message(
+                stream,
+                {"type": "result", "lease": reply["lease"], "result": test_result},
+            )
+            receive_message(stream)
+            num_tests_executed += 1
 
-    used_functions = trace_dependencies_for_test(
-        absolute_test_directory_path, used_functions
-    )
+    return num_tests_executed
 
-    contents["dependencies"] = []
-    dependencies = []
 
-    for function in used_functions:
-        unmangled_function_name = unmangle_cxx_function_name(function)
-        if unmangled_function_name not in contents["targets"]:
-            contents["dependencies"].append(unmangled_function_name)
-            dependencies.append(function)
+def print_retried_tests(test_results: list[dict[str, Any]]) -> None:
+    retried_test_results: list[dict[str, Any]] = [
+        test_result for test_result in test_results if len(test_result["attempts"]) > 1
+    ]
 
-    with open(absolute_test_info_json_filepath, "w") as file:
-        json.dump(contents, file, indent=2)
+    if len(retried_test_results) == 0:
+        return
 
-    targeted_but_unused_functions: list[dict[str, str]] = [
-        function for function in contents["targets"] if function not in contents["used"]
-    ]
+    print_empty_line()
+    print("Retried Tests:")
+
+    for test_result in retried_test_results:
+        attempts: list[dict[str, Any]] = test_result["attempts"]
+        label: str = attempts[-1]["outcome"]
+
+        if attempts[-1]["outcome"] == "passed":
+            # A test that only failed in a shared session is not flaky.
+            label = (
+                "flaky"
+                if any(not attempt.get("session", False) for attempt in attempts[:-1])
+                else "passed alone"
+            )
 
-    if len(targeted_but_unused_functions) > 0:
-        report_warning(
-            "Test does not have all of the functions it claims to evaluate.",
-            [
-                "Update the test with code to evaluate the missing functions, or",
-                "Remove the names of the missing functions from the list of functions the test claims to evaluate.",
-            ],
-        )
+        print(f"  {test_result['test']} ({label}):")
+
+        for attempt_number, attempt in enumerate(attempts, start=1):
+            print(
+                f"    {attempt_number}. {attempt['outcome']} in {attempt['duration']:.2f} s"
+                + (" (in session)" if attempt.get("session", False) else "")
+            )
 
     return
 
 
-def build_test(
-    absolute_root_test_directory_path: str, absolute_test_directory_path: str
-) -> None:
+def parse_command_line_arguments() -> argparse.Namespace:
+    global AUTOTESTER_COMMAND
+    global UPDATE_PERFORMANCE_BASELINES
+    global UPDATE_CODE_SIZE_BASELINES
+    global USE_OBJECT_CACHE
+    global DEFAULT_BUILD_TIMEOUT
+    global DEFAULT_EXECUTE_TIMEOUT
+    global NUM_RETRIES
+    global SESSION_SIZE
+    global NUM_JOBS
+    global NUM_PLAN_EXECUTORS
+    global PROFILE_HOT_PATHS
+    global PHASE_PROFILER
+    global CONSOLE_MODE
+    global ABSOLUTE_PATH_TO_LOG_DIRECTORY
+
+    parser = argparse.ArgumentParser(
+        description="TI-84 Plus CE SDK Automated Test Framework"
+    )
+    parser.add_argument("--version", action="version", version=VERSION)
+    parser.add_argument(
+        "--autotester",
+        default=AUTOTESTER_COMMAND,
+        help="program that executes each test's autotest JSON file",
+    )
+    parser.add_argument(
+        "--update-performance-baselines",
+        action="store_true",
+        help="replace the performance baselines with this run's measurements",
+    )
+    parser.add_argument(
+        "--update-code-size-baselines",
+        action="store_true",
+        help="replace the code size baselines with this run's measurements",
+    )
+    parser.add_argument(
+        "--no-object-cache",
+        action="store_true",
+        help="compile every test's sources instead of reusing cached listings",
+    )
+    parser.add_argument(
+        "--build-timeout",
+        type=float,
+        default=DEFAULT_BUILD_TIMEOUT,
+        metavar="SECONDS",
+        help="default time limit for building one test",
+    )
+    parser.add_argument(
+        "--execute-timeout",
+        type=float,
+        default=DEFAULT_EXECUTE_TIMEOUT,
+        metavar="SECONDS",
+        help="default time limit for executing one test",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=NUM_RETRIES,
+        metavar="N",
+        help="rerun a failed or timed-out test up to N more times",
+    )
+    parser.add_argument(
+        "--resource-report",
+        metavar="PATH",
+        help="write the resource usage of every subprocess to a JSON file",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="DIRECTORY",
+        help="profile each phase of the run with cProfile and write one .pstats"
+        + " file per phase to this directory",
+    )
+    parser.add_argument(
+        "--profile-hot",
+        metavar="PATH",
+        help="count the calls and time of the dependency tracer, parser, and"
+        + " batcher, and write their collapsed stacks to this file",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=NUM_JOBS,
+        metavar="N",
+        help="trace the tests' dependencies in up to N processes",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="print the batch plan and its estimated cost without building anything",
+    )
+    parser.add_argument(
+        "--plan-executors",
+        type=int,
+        default=NUM_PLAN_EXECUTORS,
+        metavar="N",
+        help="with --plan, the number of parallel executors to estimate for",
+    )
+    parser.add_argument(
+        "--session-size",
+        type=int,
+        default=SESSION_SIZE,
+        metavar="N",
+        help=(
+            "execute up to N independent tests in one emulator session (at most"
+            f" {len(SESSION_PROGRAM_LAUNCH_KEYS)})"
+        ),
+    )
+    parser.add_argument(
+        "--console",
+        choices=["verbose", "compact"],
+        default=CONSOLE_MODE,
+        help="print every detail, or only a progress line and failures",
+    )
+    parser.add_argument(
+        "--log-directory",
+        default=ABSOLUTE_PATH_TO_LOG_DIRECTORY,
+        metavar="PATH",
+        help="directory that receives the per-test subprocess logs",
+    )
+    parser.add_argument(
+        "--events",
+        metavar="PATH",
+        help="write progress events to a JSON lines file",
+    )
+    parser.add_argument(
+        "--junit",
+        metavar="PATH",
+        help="write the test results to a JUnit XML file",
+    )
 
-    test_identifier: str = get_test_identifier(
-        absolute_root_test_directory_path, absolute_test_directory_path
+    subparsers = parser.add_subparsers(
+        dest="command",
+        metavar="COMMAND",
+        help="build and execute the tests on this machine if omitted",
+    )
+    coordinate_parser = subparsers.add_parser(
+        "coordinate",
+        help="build the tests, then hand them out to workers over TCP",
+    )
+    coordinate_parser.add_argument(
+        "--listen",
+        default="127.0.0.1:7473",
+        metavar="HOST:PORT",
+        help="address to accept workers on",
+    )
+    worker_parser = subparsers.add_parser(
+        "worker",
+        help="execute tests that a coordinator hands out",
+    )
+    worker_parser.add_argument(
+        "--connect",
+        required=True,
+        metavar="HOST:PORT",
+        help="address of the coordinator",
+    )
+    build_parser = subparsers.add_parser(
+        "build",
+        help="build the tests and write them, with their plan, to a bundle",
+    )
+    build_parser.add_argument(
+        "--output",
+        default="tests_bundle.tar.gz",
+        metavar="PATH",
+        help="path of the bundle to write",
+    )
+    run_parser = subparsers.add_parser(
+        "run",
+        help="execute the tests in a bundle without building them",
     )
-    test_header: str = ""
 
-    if CLEAN_THEN_BUILD_TESTS:
-        test_header = f"Cleaning and compiling '{test_identifier}'"
-    else:
-        test_header = f"Compiling '{test_identifier}'"
+    for bundle_parser in (coordinate_parser, worker_parser, run_parser):
+        bundle_parser.add_argument(
+            "--bundle",
+            required=bundle_parser is run_parser,
+            metavar="PATH",
+            help="take the built tests and their plan from this bundle",
+        )
 
-    print_empty_line()
-    print(test_header)
-    print_subdivider()
+    arguments: argparse.Namespace = parser.parse_args()
+
+    AUTOTESTER_COMMAND = arguments.autotester
+
+    # Tests are executed from their own directories, so a relative path to
+    # the autotester must be resolved first.
+    if os.sep in AUTOTESTER_COMMAND:
+        AUTOTESTER_COMMAND = os.path.abspath(AUTOTESTER_COMMAND)
+    UPDATE_PERFORMANCE_BASELINES = arguments.update_performance_baselines
+    UPDATE_CODE_SIZE_BASELINES = arguments.update_code_size_baselines
+    USE_OBJECT_CACHE = not arguments.no_object_cache
+    DEFAULT_BUILD_TIMEOUT = arguments.build_timeout
+    DEFAULT_EXECUTE_TIMEOUT = arguments.execute_timeout
+    NUM_RETRIES = max(0, arguments.retries)
+    SESSION_SIZE = max(1, arguments.session_size)
+    NUM_JOBS = max(1, arguments.jobs)
+    NUM_PLAN_EXECUTORS = max(1, arguments.plan_executors)
+    PROFILE_HOT_PATHS = arguments.profile_hot is not None
+    CONSOLE_MODE = arguments.console
+    ABSOLUTE_PATH_TO_LOG_DIRECTORY = os.path.abspath(arguments.log_directory)
+
+    os.makedirs(ABSOLUTE_PATH_TO_LOG_DIRECTORY, exist_ok=True)
+
+    if arguments.events is not None:
+        EVENT_BUS.subscribe(JsonLinesEventWriter(os.path.abspath(arguments.events)))
+
+    if arguments.junit is not None:
+        EVENT_BUS.subscribe(JUnitReportWriter(os.path.abspath(arguments.junit)))
+
+    if not arguments.plan:
+        EVENT_BUS.subscribe(
+            DurationHistoryWriter(ABSOLUTE_PATH_TO_DURATION_HISTORY_FILE)
+        )
 
-    if CLEAN_THEN_BUILD_TESTS:
-        clean_old_build_files(
-            absolute_test_directory_path, absolute_root_test_directory_path
+    if arguments.profile is not None:
+        PHASE_PROFILER = PhaseProfiler(os.path.abspath(arguments.profile))
+        EVENT_BUS.subscribe(PHASE_PROFILER)
+
+    if CONSOLE_MODE == "compact":
+        EVENT_BUS.subscribe(CompactConsoleRenderer(sys.stdout))
+        # The detailed output still gets written, but to the run log.
+        sys.stdout = open(
+            os.path.join(ABSOLUTE_PATH_TO_LOG_DIRECTORY, "runtests.log"), "w"
         )
 
-    build_test_in_debug_mode(
-        absolute_test_directory_path, absolute_root_test_directory_path
+    return arguments
+
+
+def estimate_batch_duration(durations: list[float], num_executors: int) -> float:
+    """
+    Estimates how long a batch takes on the executors by giving the longest
+    remaining test to whichever executor becomes free first.
+    """
+    executor_durations: list[float] = [0.0] * max(
+        1, min(num_executors, len(durations))
     )
-    print("Compilation successful.")
 
-    return
+    for duration in sorted(durations, reverse=True):
+        executor_durations[executor_durations.index(min(executor_durations))] += (
+            duration
+        )
 
+    return max(executor_durations)
 
-def directory_holds_test(
-    absolute_root_test_directory_path: str, absolute_current_directory_path: str
-) -> bool:
-    directory_contents: list[str] = os.listdir(absolute_current_directory_path)
-    test_identifier: str = get_test_identifier(
-        absolute_root_test_directory_path, absolute_current_directory_path
+
+def print_test_plan(batcher: TestBatcher, num_executors: int) -> None:
+    """
+    Prints the batches the batcher planned with their estimated execution
+    times, the critical path through the tests' dependencies, the speedup
+    num_executors parallel executors could reach, and the tests that their
+    dependencies hold back to late batches.
+
+    The estimates come from the durations recorded in earlier runs. Tests
+    without a recorded duration are assumed to take the average time.
+    """
+    history: dict[str, dict[str, float]] = load_duration_history(
+        ABSOLUTE_PATH_TO_DURATION_HISTORY_FILE
     )
-    source_directory_found: bool = False
-    test_info_json_found: bool = False
-    autotest_json_found: bool = False
-    warning_occurred: bool = False
+    test_manifests: dict[str, dict[str, Any]] = batcher.get_test_manifests()
+    batches: list[list[str]] = [
+        [
+            get_test_identifier(ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, path)
+            for path in batch
+        ]
+        for batch in batcher.get_batches()
+    ]
+    batch_numbers: dict[str, int] = {
+        test_identifier: batch_number
+        for batch_number, batch in enumerate(batches)
+        for test_identifier in batch
+    }
+    manifests: dict[str, dict[str, Any]] = {
+        get_test_identifier(ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, path): manifest
+        for path, manifest in test_manifests.items()
+    }
+    recorded_durations: list[float] = [
+        history[test_identifier]["execute"]
+        for test_identifier in batch_numbers
+        if "execute" in history.get(test_identifier, {})
+    ]
+    average_duration: float = (
+        sum(recorded_durations) / len(recorded_durations)
+        if len(recorded_durations) > 0
+        else 1.0
+    )
+    durations: dict[str, float] = {
+        test_identifier: history.get(test_identifier, {}).get(
+            "execute", average_duration
+        )
+        for test_identifier in batch_numbers
+    }
 
-    if TEST_SOURCE_DIRECTORY_NAME in directory_contents:
-        source_directory_found = True
+    if len(recorded_durations) < len(durations):
+        print(
+            f"{len(durations) - len(recorded_durations)} of {len(durations)} tests"
+            f" have no recorded duration and are assumed to take {average_duration:.2f} s."
+        )
 
-    if TEST_INFO_JSON_FILENAME in directory_contents:
-        test_info_json_found = True
+    serial_duration: float = sum(durations.values())
+    parallel_duration: float = 0.0
 
-    if AUTOTEST_JSON_FILENAME in directory_contents:
-        autotest_json_found = True
+    for batch_number, batch in enumerate(batches):
+        batch_duration: float = estimate_batch_duration(
+            [durations[test_identifier] for test_identifier in batch], num_executors
+        )
+        parallel_duration += batch_duration
 
-    if source_directory_found or test_info_json_found or autotest_json_found:
-        if not source_directory_found:
-            report_warning(
-                f"'{test_identifier}' does not have a source directory.",
-                ["Create a source directory and add source code to test."],
-            )
-            warning_occurred = True
+        print_empty_line()
+        print(
+            f"Batch {batch_number + 1}: {len(batch)} tests,"
+            f" ~{sum(durations[test_identifier] for test_identifier in batch):.2f} s"
+            f" (~{batch_duration:.2f} s with {num_executors} executors)"
+        )
 
-        if not test_info_json_found:
-            report_warning(
-                f"'{test_identifier}' does not have a JSON file for test information.",
-                ["Create the JSON file for test information in the test directory."],
-            )
-            warning_occurred = True
+        for test_identifier in batch:
+            print(f"  {test_identifier:<64}{durations[test_identifier]:>8.2f} s")
+
+    # A test has to wait for the tests in earlier batches whose targets are
+    # among its dependencies. The binding one is the provider of the
+    # dependency that is tested last.
+    providers: dict[str, list[str]] = {}
+    critical_path_durations: dict[str, float] = {}
+    critical_path_predecessors: dict[str, Optional[str]] = {}
+    binding_providers: dict[str, tuple[str, str]] = {}
+    unordered_dependencies: dict[str, list[str]] = {}
+
+    for test_identifier, manifest in manifests.items():
+        for target in manifest["targets"]:
+            providers.setdefault(target, []).append(test_identifier)
+
+    for batch in batches:
+        for test_identifier in batch:
+            predecessor: Optional[str] = None
+
+            for dependency in manifests[test_identifier]["dependencies"]:
+                earlier_providers: list[str] = [
+                    provider
+                    for provider in providers.get(dependency, [])
+                    if batch_numbers[provider] < batch_numbers[test_identifier]
+                ]
+
+                if len(earlier_providers) == 0:
+                    unordered_dependencies.setdefault(test_identifier, []).append(
+                        dependency
+                    )
+                    continue
 
-        if not autotest_json_found:
-            report_warning(
-                f"'{test_identifier}' does not have an autotest JSON file.",
-                ["Add an autotest JSON file to the test directory."],
-            )
-            warning_occurred = True
+                first_provider: str = min(
+                    earlier_providers, key=lambda provider: batch_numbers[provider]
+                )
 
-        if warning_occurred:
-            report_fatal_error_then_exit(
-                "Invalid test directory structure initiated program abort."
+                if test_identifier not in binding_providers or (
+                    batch_numbers[first_provider]
+                    > batch_numbers[binding_providers[test_identifier][1]]
+                ):
+                    binding_providers[test_identifier] = (dependency, first_provider)
+
+                for provider in earlier_providers:
+                    if predecessor is None or (
+                        critical_path_durations[provider]
+                        > critical_path_durations[predecessor]
+                    ):
+                        predecessor = provider
+
+            critical_path_predecessors[test_identifier] = predecessor
+            critical_path_durations[test_identifier] = durations[test_identifier] + (
+                critical_path_durations[predecessor] if predecessor is not None else 0.0
             )
-    else:
-        return False
 
-    return True
+    print_empty_line()
+    print(
+        f"Estimated execution time: {serial_duration:.2f} s with 1 executor,"
+        f" {parallel_duration:.2f} s with {num_executors}"
+        f" ({serial_duration / max(parallel_duration, 1e-9):.1f}x speedup)."
+    )
 
+    if len(critical_path_durations) > 0:
+        critical_path: list[str] = [
+            max(critical_path_durations, key=critical_path_durations.get)
+        ]
 
-def build_tests_in_directory(
-    absolute_root_test_directory_path: str,
-    absolute_current_directory_path: Optional[str] = None,
-) -> int:
-    if absolute_current_directory_path is None:
-        absolute_current_directory_path = absolute_root_test_directory_path
+        while critical_path_predecessors[critical_path[-1]] is not None:
+            critical_path.append(critical_path_predecessors[critical_path[-1]])
 
-    directory_contents = os.scandir(absolute_current_directory_path)
-    num_built_tests: int = 0
+        critical_path_duration: float = critical_path_durations[critical_path[0]]
 
-    # TODO: Randomly shuffle the directory_contents.
+        print(
+            f"Critical path: {critical_path_duration:.2f} s, which limits the"
+            f" speedup to {serial_duration / max(critical_path_duration, 1e-9):.1f}x:"
+        )
 
-    for entry in directory_contents:
-        if entry.is_file():
-            continue
+        for count, test_identifier in enumerate(reversed(critical_path), start=1):
+            print(f"  {count}. {test_identifier} ({durations[test_identifier]:.2f} s)")
 
-        absolute_subdirectory_path: str = os.path.join(
-            absolute_current_directory_path, entry
+    late_tests: list[str] = [
+        test_identifier
+        for test_identifier in batch_numbers
+        if batch_numbers[test_identifier] >= 2
+        or (
+            batch_numbers[test_identifier] > 0
+            and test_identifier in unordered_dependencies
         )
+    ]
 
-        if directory_holds_test(
-            absolute_root_test_directory_path, absolute_subdirectory_path
-        ):
-            build_test(absolute_root_test_directory_path, absolute_subdirectory_path)
-            update_test_info_json(absolute_subdirectory_path)
-            print("Updated test information JSON file.")
-            num_built_tests += 1
-        else:
-            num_built_tests += build_tests_in_directory(
-                absolute_root_test_directory_path, absolute_subdirectory_path
-            )
-
-    return num_built_tests
+    if len(late_tests) == 0:
+        return
 
+    print_empty_line()
+    print("Tests Held Back By Their Dependencies:")
 
-class TestBatcher:
-    _batches: list[list[dict[str, (str | list[str])]]] = []
-    _unfulfilled_batch: list[dict[str, (str | list[str])]] = []
+    for test_identifier in late_tests:
+        print(f"  {test_identifier} (batch {batch_numbers[test_identifier] + 1}):")
 
-    def __init__(self):
-        self._batch_tests_in_directory(ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY)
-        self._batch_tests_that_have_recursive_dependencies()
-        return
+        for dependency in unordered_dependencies.get(test_identifier, []):
+            print(
+                f"    {test_identifier} needs {dependency}, which no earlier batch"
+                " tests"
+            )
 
-    def _batch_test(self, test: dict[str, (str | list[str])], batch_num: int) -> None:
-        if batch_num > len(self._batches):
-            report_fatal_error_then_exit("Unusually high batch number")
-        elif batch_num == len(self._batches):
-            self._batches.append([test])
-        else:
-            self._batches[batch_num].append(test)
+        chain_test_identifier: str = test_identifier
 
-        return
+        while chain_test_identifier in binding_providers:
+            dependency, provider = binding_providers[chain_test_identifier]
+            print(
+                f"    {chain_test_identifier} needs {dependency}, tested by {provider}"
+                f" (batch {batch_numbers[provider] + 1})"
+            )
+            chain_test_identifier = provider
 
-    def _batch_test_as_unfulfilled(self, test: dict[str, (str | list[str])]) -> None:
-        if PRINT_BATCH_BUILDING:
-            print("Unfulfilled test added:", test["path"])
+    return
 
-        self._unfulfilled_batch.append(test)
-        return
 
-    def _evaluate_unfulfilled_batch(
-        self,
-        added_tests: list[dict[str, (str, list[str])]],
-        batch_number_of_added_tests: int,
-    ) -> None:
-        next_set_of_added_tests: list[dict[str, (str, list[str])]] = []
+def write_test_bundle(absolute_bundle_path: str, batcher: TestBatcher) -> int:
+    """
+    Writes everything needed to execute the batcher's plan to a compressed
+    archive: each test's transfer files, autotest JSON file and test
+    information JSON file, plus the plan itself. Returns how many tests the
+    bundle holds.
+    """
+    batches: list[list[str]] = [
+        [
+            get_test_identifier(ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, path)
+            for path in batch
+        ]
+        for batch in batcher.get_batches()
+    ]
+    test_manifests: dict[str, dict[str, Any]] = batcher.get_test_manifests()
+    num_bundled_tests: int = 0
+
+    def add_json_file(bundle: tarfile.TarFile, arcname: str, contents: Any) -> None:
+        data: bytes = json.dumps(contents, indent=2).encode()
+        file_info = tarfile.TarInfo(arcname)
+        file_info.size = len(data)
+        file_info.mtime = int(time.time())
+        bundle.addfile(file_info, io.BytesIO(data))
+        return
 
-        if PRINT_BATCH_BUILDING:
-            for test in added_tests:
-                print(
-                    ("  " * batch_number_of_added_tests) + "Added test:", test["path"]
+    with tarfile.open(absolute_bundle_path, "w:gz") as bundle:
+        for batch in batches:
+            for test_identifier in batch:
+                absolute_test_directory_path: str = os.path.join(
+                    ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, test_identifier
                 )
+                archived_test_directory: str = "/".join(
+                    ["tests"] + test_identifier.split(os.sep)
+                )
+                autotest_contents: dict[str, Any] = {}
 
-        for added_test in added_tests:
-            for test in self._unfulfilled_batch:
-                if len(test["dependencies"]) == 0:
-                    continue
+                with open(
+                    os.path.join(absolute_test_directory_path, AUTOTEST_JSON_FILENAME)
+                ) as file:
+                    autotest_contents = json.load(file)
 
-                test["dependencies"] = list(
-                    set(test["dependencies"]) - set(added_test["targets"])
+                for transfer_file in autotest_contents["transfer_files"]:
+                    bundle.add(
+                        os.path.join(absolute_test_directory_path, transfer_file),
+                        archived_test_directory + "/" + transfer_file,
+                    )
+
+                add_json_file(
+                    bundle,
+                    archived_test_directory + "/" + AUTOTEST_JSON_FILENAME,
+                    autotest_contents,
+                )
+                add_json_file(
+                    bundle,
+                    archived_test_directory + "/" + TEST_INFO_JSON_FILENAME,
+                    test_manifests[absolute_test_directory_path],
                 )
+                num_bundled_tests += 1
+
+        add_json_file(
+            bundle,
+            BUNDLE_MANIFEST_FILENAME,
+            {
+                "version": VERSION,
+                "batches": [
+                    [test_identifier.split(os.sep) for test_identifier in batch]
+                    for batch in batches
+                ],
+            },
+        )
 
-                if len(test["dependencies"]) == 0:
-                    if PRINT_BATCH_BUILDING:
-                        print(
-                            ("  " * batch_number_of_added_tests) + "Added:",
-                            test["path"],
-                        )
+    return num_bundled_tests
 
-                    next_set_of_added_tests.append(test)
-                    self._batch_test(test, batch_number_of_added_tests + 1)
 
-        unfulfilled_batch: list[
-            dict[str, (str, list[str])]
-        ] = self._unfulfilled_batch.copy()
+def load_test_bundle(
+    absolute_bundle_path: str,
+) -> tuple[list[list[str]], dict[str, dict[str, Any]]]:
+    """
+    Extracts a bundle that write_test_bundle() created into a temporary
+    directory, makes that directory the root test directory, and returns the
+    bundle's plan along with the tests' manifests.
+    """
+    global ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY
 
-        for test in self._unfulfilled_batch:
-            if len(test["dependencies"]) == 0:
-                unfulfilled_batch.remove(test)
+    absolute_extraction_directory_path: str = tempfile.mkdtemp(
+        prefix="ce_autotest_bundle_"
+    )
+    atexit.register(
+        shutil.rmtree, absolute_extraction_directory_path, ignore_errors=True
+    )
 
-        self._unfulfilled_batch = unfulfilled_batch
+    try:
+        with tarfile.open(absolute_bundle_path, "r:gz") as bundle:
+            if hasattr(tarfile, "data_filter"):
+                bundle.extractall(absolute_extraction_directory_path, filter="data")
+            else:
+                bundle.extractall(absolute_extraction_directory_path)
+    except (OSError, tarfile.TarError) as error:
+        report_fatal_error_then_exit(
+            error.__str__(), ["Rebuild the bundle with 'runtests.py build'."]
+        )
 
-        if len(next_set_of_added_tests) > 0:
-            self._evaluate_unfulfilled_batch(
-                next_set_of_added_tests, batch_number_of_added_tests + 1
-            )
+    bundle_manifest: dict[str, Any] = {}
 
-        return
+    with open(
+        os.path.join(absolute_extraction_directory_path, BUNDLE_MANIFEST_FILENAME)
+    ) as file:
+        bundle_manifest = json.load(file)
 
-    def _assign_test_to_batch(self, absolute_test_directory_path: str) -> None:
-        contents: list[str] = []
-        test_info_json: str = os.path.join(
-            absolute_test_directory_path, TEST_INFO_JSON_FILENAME
+    if bundle_manifest["version"] != VERSION:
+        report_warning(
+            f"The bundle was built by version {bundle_manifest['version']} of the testing script, not {VERSION}."
         )
 
-        with open(test_info_json, "r") as file:
-            contents = json.load(file)
+    ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY = os.path.join(
+        absolute_extraction_directory_path, "tests"
+    )
+    batches: list[list[str]] = [
+        [
+            os.path.join(ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, *test_identifier_parts)
+            for test_identifier_parts in batch
+        ]
+        for batch in bundle_manifest["batches"]
+    ]
+    test_manifests: dict[str, dict[str, Any]] = {}
 
-        test: dict[str, (str | list[str])] = {}
-        test["path"] = absolute_test_directory_path
-        test["targets"] = contents["targets"]
-        test["dependencies"] = contents["dependencies"]
-        batch_number: Optional[int] = None
+    for batch in batches:
+        for absolute_test_directory_path in batch:
+            test_manifests[absolute_test_directory_path] = load_test_manifest(
+                absolute_test_directory_path
+            )
 
-        if len(test["dependencies"]) == 0:
-            batch_number = 0
-        else:
-            for index, batch in enumerate(self._batches):
-                for batch_test in batch:
-                    test["dependencies"] = list(
-                        set(test["dependencies"]) - set(batch_test["targets"])
-                    )
+    return (batches, test_manifests)
 
-                    if len(test["dependencies"]) == 0:
-                        batch_number = index + 1
-                        break
 
-                if batch_number is not None:
-                    break
+def build_all_tests() -> tuple[int, dict[str, dict[str, Any]], list[str]]:
+    """
+    Builds and traces every test, and returns how many were built along with
+    their manifests and the tests that failed their code size check.
+    """
+    print_section_header("Building Tests")
+    EVENT_BUS.emit("phase_start", phase="build")
 
-        if batch_number is None:
-            self._batch_test_as_unfulfilled(test)
-        else:
-            self._batch_test(test, batch_number)
-            self._evaluate_unfulfilled_batch([test], batch_number)
-        return
+    test_manifests: dict[str, dict[str, Any]] = {}
+    object_cache: Optional[ObjectCache] = None
 
-    def _batch_tests_in_directory(self, absolute_directory_path: str) -> None:
-        directory_contents = os.scandir(absolute_directory_path)
+    if USE_OBJECT_CACHE:
+        object_cache = ObjectCache(ABSOLUTE_PATH_TO_OBJECT_CACHE_DIRECTORY)
 
-        for entry in directory_contents:
-            if entry.is_file():
-                continue
+    num_built_tests: int = build_tests_in_directory(
+        ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY,
+        test_manifests=test_manifests,
+        object_cache=object_cache,
+    )
+    EVENT_BUS.emit("phase_start", phase="trace")
+    failed_code_size_tests: list[str] = trace_built_tests(test_manifests)
+    print_empty_line()
+    print_centered(f"{num_built_tests} tests built.")
 
-            absolute_subdirectory_path: str = os.path.join(
-                absolute_directory_path, entry
-            )
+    if object_cache is not None:
+        num_restored_objects, num_stored_objects = object_cache.get_statistics()
+        print_centered(
+            f"{num_restored_objects} objects reused, {num_stored_objects} objects cached."
+        )
 
-            if directory_holds_test(
-                ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, absolute_subdirectory_path
-            ):
-                self._assign_test_to_batch(absolute_subdirectory_path)
-            else:
-                self._batch_tests_in_directory(absolute_subdirectory_path)
+    return (num_built_tests, test_manifests, failed_code_size_tests)
 
+
+def print_failed_code_size_tests(failed_code_size_tests: list[str]) -> None:
+    if len(failed_code_size_tests) == 0:
         return
 
-    def _batch_tests_that_have_recursive_dependencies(self) -> None:
-        if len(self._unfulfilled_batch) == 0:
-            return
+    print_centered(f"{len(failed_code_size_tests)} tests failed their code size check.")
+    print_empty_line()
 
-        total_targets: list[str] = []
+    for test_identifier in failed_code_size_tests:
+        print("  " + test_identifier)
 
-        for test in self._unfulfilled_batch:
-            total_targets += test["targets"]
+    print_empty_line()
+    return
 
-        for test in self._unfulfilled_batch:
-            if len(set(test["dependencies"]) - set(total_targets)) > 0:
-                total_targets = list(set(total_targets) - set(test["dependencies"]))
 
-        unfulfilled_batch: list[
-            dict[str, (str | list[str])]
-        ] = self._unfulfilled_batch.copy()
-        final_batch_number: int = len(self._batches)
+def add_up_resource_usage(
+    records: list[dict[str, Any]], field: str
+) -> dict[str, dict[str, Any]]:
+    """
+    Adds up the resource usage records that have the same value for the
+    field ("test" or "phase"). CPU time is user plus system time, and the
+    peak RSS is that of the largest process.
+    """
+    totals: dict[str, dict[str, Any]] = {}
 
-        for test in self._unfulfilled_batch:
-            test_identifier: str = get_test_identifier(
-                ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, test["path"]
-            )
-            count: int = 1
+    for record in records:
+        total: dict[str, Any] = totals.setdefault(
+            record[field] or "(none)",
+            {"processes": 0, "wall_time": 0.0, "cpu_time": 0.0, "max_rss_kb": 0},
+        )
+        total["processes"] += 1
+        total["wall_time"] += record["wall_time"]
+        total["cpu_time"] += (record["user_time"] or 0.0) + (
+            record["system_time"] or 0.0
+        )
+        total["max_rss_kb"] = max(total["max_rss_kb"], record["max_rss_kb"] or 0)
 
-            if len(set(test["dependencies"]) - set(total_targets)) == 0:
-                self._batch_test(test, final_batch_number)
-                unfulfilled_batch.remove(test)
-            else:
-                print_empty_line()
-                print(
-                    "Untested Dependencies For '"
-                    + get_test_identifier(
-                        ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, test["path"]
-                    )
-                    + "':"
-                )
+    return totals
 
-                for dependency in test["dependencies"]:
-                    print(f"  {count}. " + dependency)
-                    count += 1
 
-        self._unfulfilled_batch = unfulfilled_batch
+def print_resource_usage_table(
+    title: str, column_name: str, totals: list[tuple[str, dict[str, Any]]]
+) -> None:
+    print_empty_line()
+    print(title)
+    print(
+        f"  {column_name:<38}{'Procs':>7}{'Wall s':>10}{'CPU s':>10}{'RSS MiB':>10}"
+    )
 
-        if PRINT_BATCH_BUILDING:
-            print_empty_line()
+    for name, total in totals:
+        if len(name) > 37:
+            name = "..." + name[-34:]
 
-            for index, batch in enumerate(self._batches):
-                print(f"Batch {index + 1}:")
-                for test in batch:
-                    test_identifier: str = get_test_identifier(
-                        ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, test["path"]
-                    )
-                    print("  " + test_identifier)
+        print(
+            f"  {name:<38}{total['processes']:>7}{total['wall_time']:>10.2f}"
+            f"{total['cpu_time']:>10.2f}{total['max_rss_kb'] / 1024:>10.1f}"
+        )
 
-                print_empty_line()
+    return
 
-            print("Unfulfilled Batch:")
 
-            for test in self._unfulfilled_batch:
-                test_identifier: str = get_test_identifier(
-                    ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, test["path"]
-                )
-                print("  " + test_identifier)
+def report_resource_usage(absolute_report_path: Optional[str] = None) -> None:
+    """
+    Prints the resource usage of the run's subprocesses by phase, and the
+    NUM_RESOURCE_USAGE_ROWS tests that used the most CPU time.
 
-        if len(self._unfulfilled_batch) == 0:
-            return
+    absolute_report_path: If given, the raw records and their totals are
+                          written to this JSON file.
+    """
+    totals_by_test: dict[str, dict[str, Any]] = add_up_resource_usage(
+        RESOURCE_USAGE_RECORDS, "test"
+    )
+    totals_by_phase: dict[str, dict[str, Any]] = add_up_resource_usage(
+        RESOURCE_USAGE_RECORDS, "phase"
+    )
 
-        report_fatal_error_then_exit(
-            "Some tests have untested dependencies.",
-            [
-                "Review the list of tests above and add tests whose targets evaluate the dependency functions listed.",
-                "Make sure that the targets of your existing tests have the correct function signatures.",
-            ],
-        )
+    if absolute_report_path is not None:
+        with open(absolute_report_path, "w") as file:
+            json.dump(
+                {
+                    "records": RESOURCE_USAGE_RECORDS,
+                    "tests": totals_by_test,
+                    "phases": totals_by_phase,
+                },
+                file,
+                indent=2,
+            )
+
+    if len(RESOURCE_USAGE_RECORDS) == 0:
         return
 
-    def _add_rom_field_to_autotest_json_file(self, absolute_autotest_json_path) -> None:
-        contents: list[str] = []
+    print_resource_usage_table(
+        "Resource Usage By Phase:", "Phase", list(totals_by_phase.items())
+    )
+    print_resource_usage_table(
+        f"Top {NUM_RESOURCE_USAGE_ROWS} Tests By CPU Time:",
+        "Test",
+        sorted(
+            totals_by_test.items(),
+            key=lambda item: item[1]["cpu_time"],
+            reverse=True,
+        )[:NUM_RESOURCE_USAGE_ROWS],
+    )
+    return
 
-        with open(absolute_autotest_json_path) as file:
-            contents = json.load(file)
 
-        contents["rom"] = TESTING_ROM_ABSOLUTE_PATH
+def finish_testing(
+    num_built_tests: int,
+    num_tests_executed: int,
+    failed_tests: list[str],
+    failed_code_size_tests: list[str],
+    test_results: list[dict[str, Any]],
+    run_start_time: float,
+) -> None:
+    print_retried_tests(test_results)
+    print_empty_line()
+    print_centered(f"{num_tests_executed} tests executed.")
 
-        with open(absolute_autotest_json_path, "w") as file:
-            json.dump(contents, file, indent=2)
+    if len(failed_tests) > 0:
+        print_centered(f"{len(failed_tests)} tests failed.")
+        print_empty_line()
 
-        return
+        for test_identifier in failed_tests:
+            print("  " + test_identifier)
 
-    def _remove_rom_field_from_autotest_json_file(
-        self, absolute_autotest_json_path
-    ) -> None:
-        contents: list[str] = []
+    print_empty_line()
+    print_failed_code_size_tests(failed_code_size_tests)
+    print_divider()
+    print_empty_line()
+    print_centered("TESTING COMPLETE")
+    print_empty_line()
 
-        with open(absolute_autotest_json_path) as file:
-            contents = json.load(file)
+    EVENT_BUS.emit(
+        "run_finish",
+        num_tests_built=num_built_tests,
+        num_tests_executed=num_tests_executed,
+        num_tests_failed=len(failed_tests),
+        num_tests_failed_code_size=len(failed_code_size_tests),
+        duration=time.monotonic() - run_start_time,
+    )
+    EVENT_BUS.close()
+    sys.stdout.flush()
 
-        try:
-            contents.pop("rom")
-        except KeyError:
-            pass
+    if len(failed_tests) > 0 or len(failed_code_size_tests) > 0:
+        exit(1)
 
-        with open(absolute_autotest_json_path, "w") as file:
-            json.dump(contents, file, indent=2)
+    return
 
-        return
 
-    def _execute_test(self, absolute_test_directory_path: str) -> None:
-        test_identifier: str = get_test_identifier(
-            ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY, absolute_test_directory_path
-        )
-        print_empty_line()
-        print(f"Executing '{test_identifier}':")
-        print_subdivider()
+def main():
+    arguments: argparse.Namespace = parse_command_line_arguments()
+    run_start_time: float = time.monotonic()
+    EVENT_BUS.emit("run_start", version=VERSION)
 
-        os.chdir(absolute_test_directory_path)
-        absolute_autotest_json_path: str = os.path.join(
-            absolute_test_directory_path, AUTOTEST_JSON_FILENAME
+    print_program_banner()
+
+    bundled_batches: Optional[list[list[str]]] = None
+    num_built_tests: int = 0
+    test_manifests: dict[str, dict[str, Any]] = {}
+    failed_code_size_tests: list[str] = []
+    absolute_resource_report_path: Optional[str] = None
+    absolute_hot_path_report_path: Optional[str] = None
+
+    if arguments.resource_report is not None:
+        absolute_resource_report_path = os.path.abspath(arguments.resource_report)
+
+    if arguments.profile_hot is not None:
+        absolute_hot_path_report_path = os.path.abspath(arguments.profile_hot)
+
+    if getattr(arguments, "bundle", None) is not None:
+        bundled_batches, test_manifests = load_test_bundle(
+            os.path.abspath(arguments.bundle)
         )
 
-        self._add_rom_field_to_autotest_json_file(absolute_autotest_json_path)
+        # The tests of a bundle are extracted to a temporary directory, and
+        # code size is only checked when the tests are built.
+        if UPDATE_CODE_SIZE_BASELINES:
+            report_warning(
+                "Code size baselines are not recorded when the tests are taken from a bundle.",
+                ["Rerun the tests without --bundle to record them."],
+            )
 
-        try:
-            subprocess.run(["cemu-autotester", "./autotest.json"], check=True)
-        except subprocess.CalledProcessError as error:
-            self._remove_rom_field_from_autotest_json_file(absolute_autotest_json_path)
+        if UPDATE_PERFORMANCE_BASELINES and arguments.command != "worker":
+            report_warning(
+                "Performance baselines recorded from a bundle are not saved to the project.",
+                ["Rerun the tests without --bundle to record them."],
+            )
 
-            if ABORT_ON_FIRST_FAILED_TEST:
-                report_fatal_error_then_exit(error.__str__())
+    if arguments.plan:
+        print_section_header("Test Plan")
+        EVENT_BUS.emit("phase_start", phase="plan")
+        print_test_plan(
+            TestBatcher(test_manifests, bundled_batches), NUM_PLAN_EXECUTORS
+        )
 
-        self._remove_rom_field_from_autotest_json_file(absolute_autotest_json_path)
+        if absolute_hot_path_report_path is not None:
+            report_hot_paths(absolute_hot_path_report_path)
 
-        os.chdir(ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY)
+        print_empty_line()
+        EVENT_BUS.close()
         return
 
-    def run_tests(self) -> int:
-        num_tests_executed: int = 0
+    if arguments.command == "worker":
+        print_section_header("Executing Tests")
+        print(f"Working for the coordinator at {arguments.connect}.")
+        num_tests_executed: int = run_worker(parse_address(arguments.connect))
+        print_empty_line()
+        report_resource_usage(absolute_resource_report_path)
 
-        for batch in self._batches:
+        if absolute_hot_path_report_path is not None:
+            report_hot_paths(absolute_hot_path_report_path)
 
-            # TODO: Randomly shuffle the tests in each batch.
+        print_empty_line()
+        print_centered(f"{num_tests_executed} tests executed by this worker.")
+        print_empty_line()
+        EVENT_BUS.close()
+        return
 
-            for test in batch:
-                self._execute_test(test["path"])
-                num_tests_executed += 1
+    if bundled_batches is None:
+        num_built_tests, test_manifests, failed_code_size_tests = build_all_tests()
 
-        return num_tests_executed
+    if arguments.command == "build":
+        batcher = TestBatcher(test_manifests)
+        absolute_bundle_path: str = os.path.abspath(arguments.output)
+        num_bundled_tests: int = write_test_bundle(absolute_bundle_path, batcher)
 
+        report_resource_usage(absolute_resource_report_path)
 
-def main():
-    print_program_banner()
-    print_section_header("Building Tests")
+        if absolute_hot_path_report_path is not None:
+            report_hot_paths(absolute_hot_path_report_path)
 
-    num_built_tests: int = build_tests_in_directory(
-        ABSOLUTE_PATH_TO_ROOT_TEST_DIRECTORY
-    )
-    print_empty_line()
-    print_centered(f"{num_built_tests} tests built.")
+        print_empty_line()
+        print_centered(
+            f"{num_bundled_tests} tests written to '{absolute_bundle_path}'."
+        )
+        print_empty_line()
+        print_failed_code_size_tests(failed_code_size_tests)
+        EVENT_BUS.close()
+
+        if len(failed_code_size_tests) > 0:
+            exit(1)
+
+        return
 
     print_section_header("Executing Tests")
 
-    batcher = TestBatcher()
-    num_tests_executed: int = batcher.run_tests()
+    batcher = TestBatcher(test_manifests, bundled_batches)
 
-    print_empty_line()
-    print_centered(f"{num_tests_executed} tests executed.")
-    print_empty_line()
-    print_divider()
-    print_empty_line()
-    print_centered("TESTING COMPLETE")
-    print_empty_line()
+    if arguments.command == "coordinate":
+        num_tests_executed = coordinate_tests(batcher, parse_address(arguments.listen))
+    else:
+        num_tests_executed = batcher.run_tests()
+
+    report_resource_usage(absolute_resource_report_path)
+
+    if absolute_hot_path_report_path is not None:
+        report_hot_paths(absolute_hot_path_report_path)
+
+    finish_testing(
+        num_built_tests,
+        num_tests_executed,
+        batcher.get_failed_tests(),
+        failed_code_size_tests,
+        batcher.get_test_results(),
+        run_start_time,
+    )
     return
 
 
@@ -0,0 +1,22 @@
+#include "../../../../src/recursion.h"
+#include "../../../test_utils.h"
+
+
+static bool test(void);
+
+
+int main(void)
+{
+  testutil_PrintTestSetup();
+  testutil_PrintTestResults(test());
+  return 0;
+}
+
+
+static bool test(void)
+{
+  testutil_StartPerformanceTimer("triple_recursion_test");
+  triple_recursion_test();
+  testutil_StopPerformanceTimer("triple_recursion_test");
+  return true;
+}
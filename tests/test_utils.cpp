@@ -1,3 +1,5 @@
+#include <debug.h>
+#include <sys/timers.h>
 #include <ti/getcsc.h>
 #include <ti/screen.h>
 
@@ -29,3 +31,24 @@ void testutil_PrintTestResults(bool result)
   while (!os_GetCSC());
   return;
 }
+
+
+// The performance timer functions print markers that the testing script reads
+// from the emulator's debug console. Each marker holds the value of timer 1,
+// which counts CPU cycles and is never reset, so several labels can be timed at
+// once. The script computes the elapsed cycles between a label's markers. The
+// time it takes to print the start marker is included, but it is the same on
+// every run, so it cancels out against the label's baseline.
+void testutil_StartPerformanceTimer(const char *label)
+{
+  timer_Enable(1, TIMER_CPU, TIMER_NOINT, TIMER_UP);
+  dbg_printf("ATF_PERF|%s|start|%lu\n", label, timer_GetSafe(1, TIMER_UP));
+  return;
+}
+
+
+void testutil_StopPerformanceTimer(const char *label)
+{
+  dbg_printf("ATF_PERF|%s|stop|%lu\n", label, timer_GetSafe(1, TIMER_UP));
+  return;
+}
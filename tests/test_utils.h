@@ -4,6 +4,8 @@
 
 void testutil_PrintTestSetup();
 void testutil_PrintTestResults(bool result);
+void testutil_StartPerformanceTimer(const char *label);
+void testutil_StopPerformanceTimer(const char *label);
 
 
 #endif
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Checks distributed execution of runtests.py end to end on localhost, with
+stub_autotester.py standing in for the emulator. The tests are built with the
+CE toolchain in a temporary copy of the project, so the checked-in
+test_info.json files are never touched. Run it from anywhere with the CE
+toolchain on the path.
+
+A coordinator hands the tests to several workers that execute them from a
+bundle, as they would on other machines. The first worker is killed while it
+executes a test, so the test must be requeued. The check makes sure that the
+run passes, that every test has exactly one result, and that the performance
+baseline a worker records is saved to the coordinator's copy of the test.
+"""
+
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+
+ABSOLUTE_PATH_TO_PROJECT_DIRECTORY: str = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))
+)
+TEST_IDENTIFIER: str = os.path.join("performance_tests", "triple_recursion_performance")
+LABEL: str = "triple_recursion_test"
+CYCLES: int = 1000
+NUM_WORKERS: int = 3
+
+
+def copy_project(absolute_destination_path: str) -> None:
+    for name in ("src", "tests"):
+        shutil.copytree(
+            os.path.join(ABSOLUTE_PATH_TO_PROJECT_DIRECTORY, name),
+            os.path.join(absolute_destination_path, name),
+        )
+
+    return
+
+
+def find_test_identifiers(absolute_project_path: str) -> set[str]:
+    absolute_tests_path: str = os.path.join(absolute_project_path, "tests")
+    test_identifiers: set[str] = set()
+
+    for absolute_directory_path, _, filenames in os.walk(absolute_tests_path):
+        if "test_info.json" in filenames:
+            test_identifiers.add(
+                os.path.relpath(absolute_directory_path, absolute_tests_path)
+            )
+
+    return test_identifiers
+
+
+def find_free_port() -> int:
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        return listener.getsockname()[1]
+
+
+def start_runtests(
+    absolute_project_path: str, arguments: list[str], delay: float = 0.0
+) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(ABSOLUTE_PATH_TO_PROJECT_DIRECTORY, "runtests.py"),
+            "--autotester",
+            os.path.join(
+                ABSOLUTE_PATH_TO_PROJECT_DIRECTORY, "tools", "stub_autotester.py"
+            ),
+        ]
+        + arguments,
+        cwd=absolute_project_path,
+        env=os.environ
+        | {
+            "PYTHONUNBUFFERED": "1",
+            "STUB_AUTOTESTER_DELAY": str(delay),
+            "STUB_AUTOTESTER_TIMINGS": f"{LABEL}={CYCLES}",
+        },
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        start_new_session=True,
+    )
+
+
+def kill_once_executing(worker: subprocess.Popen) -> bool:
+    """
+    Kills the worker and the autotester it started as soon as it starts
+    executing a test. Returns False if the worker exited before that.
+    """
+    for line in worker.stdout:
+        if line.startswith("Executing '"):
+            os.killpg(worker.pid, signal.SIGKILL)
+            worker.wait()
+            return True
+
+    worker.wait()
+    return False
+
+
+def main() -> int:
+    absolute_project_path: str = tempfile.mkdtemp(prefix="check_distributed_")
+    absolute_bundle_path: str = os.path.join(
+        absolute_project_path, "tests_bundle.tar.gz"
+    )
+    absolute_events_path: str = os.path.join(absolute_project_path, "events.jsonl")
+    address: str = f"127.0.0.1:{find_free_port()}"
+    processes: list[subprocess.Popen] = []
+
+    try:
+        copy_project(absolute_project_path)
+        test_identifiers: set[str] = find_test_identifiers(absolute_project_path)
+
+        build: subprocess.Popen = start_runtests(
+            absolute_project_path, ["build", "--output", absolute_bundle_path]
+        )
+        build_output: str = build.communicate()[0]
+
+        if build.returncode != 0:
+            print(build_output)
+            print(f"FAILED: building the bundle (exit code {build.returncode})")
+            return 1
+
+        print("ok: the bundle is built")
+
+        coordinator: subprocess.Popen = start_runtests(
+            absolute_project_path,
+            ["--events", absolute_events_path, "coordinate", "--listen", address],
+        )
+        processes.append(coordinator)
+
+        worker_arguments: list[str] = [
+            "--update-performance-baselines",
+            "worker",
+            "--connect",
+            address,
+            "--bundle",
+            absolute_bundle_path,
+        ]
+        slow_worker: subprocess.Popen = start_runtests(
+            absolute_project_path, worker_arguments, delay=60.0
+        )
+        processes.append(slow_worker)
+
+        if not kill_once_executing(slow_worker):
+            print(slow_worker.stdout.read())
+            print("FAILED: the first worker never executed a test")
+            return 1
+
+        print("ok: the first worker is killed while it executes a test")
+
+        workers: list[subprocess.Popen] = [
+            start_runtests(absolute_project_path, worker_arguments)
+            for _ in range(NUM_WORKERS)
+        ]
+        processes += workers
+        coordinator_output: str = coordinator.communicate(timeout=600)[0]
+
+        for worker in workers:
+            worker.communicate(timeout=60)
+
+        if coordinator.returncode != 0 or "Requeued" not in coordinator_output:
+            print(coordinator_output)
+            print(
+                f"FAILED: the run passes with the killed worker's test requeued (exit code {coordinator.returncode})"
+            )
+            return 1
+
+        print("ok: the run passes with the killed worker's test requeued")
+
+        with open(absolute_events_path) as file:
+            results: list[str] = [
+                event["test"]
+                for event in map(json.loads, file)
+                if event["event"] == "test_result"
+            ]
+
+        if sorted(results) != sorted(test_identifiers):
+            print(f"FAILED: expected one result for each of {sorted(test_identifiers)}")
+            print(f"        but got {sorted(results)}")
+            return 1
+
+        print(f"ok: each of the {len(test_identifiers)} tests has one result")
+
+        with open(
+            os.path.join(
+                absolute_project_path, "tests", TEST_IDENTIFIER, "test_info.json"
+            )
+        ) as file:
+            baseline: int = json.load(file)["performance"]["baselines"].get(LABEL)
+
+        if baseline != CYCLES:
+            print(f"FAILED: the coordinator's baseline is {baseline}, not {CYCLES}")
+            return 1
+
+        print("ok: the worker's baseline is saved by the coordinator")
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                os.killpg(process.pid, signal.SIGKILL)
+                process.wait()
+
+        shutil.rmtree(absolute_project_path, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Checks that the object cache of runtests.py shares a listing between tests
+that compile the same source from different places. It needs make and a C++
+compiler that accepts -S, such as g++ (set CXX to pick another), but not the
+CE toolchain.
+
+Two tests compile the project's src/lib.cpp: one with paths prefixed by its
+own directory, as the CE toolchain's makefile writes them, and one, a
+directory deeper, with paths relative to itself. The second test must get
+its listing from the cache instead of compiling it.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import runtests
+
+COMPILER: str = os.environ.get("CXX", "g++")
+HEADER: str = "int twice(int value);\n"
+SOURCE: str = '#include "lib.h"\n\nint twice(int value) { return value * 2; }\n'
+# Each makefile compiles src/lib.cpp into obj/lib.cpp.src for its debug
+# target, unless the listing is already there. The recipe lines must start
+# with a tab.
+ABSOLUTE_PATHS_MAKEFILE: str = f"""debug: $(CURDIR)/obj/lib.cpp.src
+
+$(CURDIR)/obj/lib.cpp.src:
+\tmkdir -p $(CURDIR)/obj
+\t{COMPILER} -S -MD -O1 -I$(CURDIR)/../../include $(CURDIR)/../../src/lib.cpp -o $@
+"""
+RELATIVE_PATHS_MAKEFILE: str = f"""debug: obj/lib.cpp.src
+
+obj/lib.cpp.src:
+\tmkdir -p obj
+\t{COMPILER} -S -MD -O1 -I ../../../include ../../../src/lib.cpp -o $@
+"""
+
+
+def write_file(absolute_filepath: str, contents: str) -> None:
+    os.makedirs(os.path.dirname(absolute_filepath), exist_ok=True)
+
+    with open(absolute_filepath, "w") as file:
+        file.write(contents)
+
+    return
+
+
+def build_test(
+    cache: runtests.ObjectCache, absolute_test_directory_path: str
+) -> tuple[int, int]:
+    """
+    Builds the test through the cache the way runtests.py does, and returns
+    how many listings were restored and stored while doing so.
+    """
+    num_restored_objects, num_stored_objects = cache.get_statistics()
+    restore_state: dict = cache.restore_objects(absolute_test_directory_path)
+    subprocess.run(
+        ["make", "debug"],
+        cwd=absolute_test_directory_path,
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+    cache.store_objects(absolute_test_directory_path, restore_state)
+    statistics: tuple[int, int] = cache.get_statistics()
+    return (
+        statistics[0] - num_restored_objects,
+        statistics[1] - num_stored_objects,
+    )
+
+
+def main() -> int:
+    absolute_project_path: str = tempfile.mkdtemp(prefix="check_object_cache_")
+
+    try:
+        write_file(os.path.join(absolute_project_path, "include", "lib.h"), HEADER)
+        write_file(os.path.join(absolute_project_path, "src", "lib.cpp"), SOURCE)
+        absolute_first_test_path: str = os.path.join(
+            absolute_project_path, "tests", "first"
+        )
+        absolute_second_test_path: str = os.path.join(
+            absolute_project_path, "tests", "group", "second"
+        )
+        write_file(
+            os.path.join(absolute_first_test_path, "makefile"), ABSOLUTE_PATHS_MAKEFILE
+        )
+        write_file(
+            os.path.join(absolute_second_test_path, "makefile"),
+            RELATIVE_PATHS_MAKEFILE,
+        )
+        cache = runtests.ObjectCache(os.path.join(absolute_project_path, "cache"))
+
+        if build_test(cache, absolute_first_test_path) != (0, 1):
+            print("FAILED: the first test's listing is compiled and cached")
+            return 1
+
+        print("ok: the first test's listing is compiled and cached")
+
+        if build_test(cache, absolute_second_test_path) != (1, 0):
+            print("FAILED: the second test's listing comes from the cache")
+            return 1
+
+        print("ok: the second test's listing comes from the cache")
+    finally:
+        shutil.rmtree(absolute_project_path, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
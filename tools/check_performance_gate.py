@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Checks the performance gate of runtests.py without the CE toolchain or an
+emulator. Run it from anywhere.
+
+The check first calls the functions that read the timing markers and compare
+them against the baselines, including recording a baseline. It then writes a
+small bundle holding one performance test, whose program is a stand-in that
+only carries the timer's label, and executes it with run --bundle, with
+stub_autotester.py standing in for the emulator: a run within the tolerance
+must pass, and a regression or a run without markers must fail.
+"""
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+ABSOLUTE_PATH_TO_PROJECT_DIRECTORY: str = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__))
+)
+
+sys.path.insert(0, ABSOLUTE_PATH_TO_PROJECT_DIRECTORY)
+
+import runtests
+
+LABEL: str = "triple_recursion_test"
+BASELINE: int = 1000
+AUTOTEST_CONTENTS: dict = {
+    "transfer_files": ["bin/TEST.8xp"],
+    "target": {"name": "TEST", "isASM": True},
+    "sequence": ["action|launch", "hashWait|1"],
+    "hashes": {
+        "1": {
+            "description": "Test for pass",
+            "start": "vram_start",
+            "size": "vram_16_size",
+            "expected_CRCs": ["C2DF8E65"],
+        }
+    },
+}
+
+
+def expect(passed: bool, description: str, output: str = "") -> bool:
+    if passed:
+        print(f"ok: {description}")
+        return True
+
+    print(output)
+    print(f"FAILED: {description}")
+    return False
+
+
+def evaluate_quietly(
+    absolute_directory_path: str, contents: dict, measurements: dict[str, int]
+) -> bool:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return runtests.evaluate_performance_measurements(
+            absolute_directory_path, contents, measurements
+        )
+
+
+def check_functions(absolute_directory_path: str) -> bool:
+    output: str = "\n".join(
+        [
+            f"{runtests.PERFORMANCE_MARKER_PREFIX}|{LABEL}|start|{(1 << 32) - 100}",
+            f"{runtests.PERFORMANCE_MARKER_PREFIX}|{LABEL}|stop|{BASELINE - 100}",
+            "[OK] Hash #1 (Test for pass) passed",
+        ]
+    )
+    measurements: dict[str, int] = runtests.extract_performance_measurements(output)
+
+    if not expect(
+        measurements == {LABEL: BASELINE},
+        "markers are paired, even when the timer wraps around",
+        str(measurements),
+    ):
+        return False
+
+    contents: dict = {"performance": {"tolerance": 0.05, "baselines": {}}}
+
+    with open(os.path.join(absolute_directory_path, "test_info.json"), "w") as file:
+        json.dump(contents, file)
+
+    runtests.UPDATE_PERFORMANCE_BASELINES = True
+    recorded: bool = evaluate_quietly(absolute_directory_path, contents, measurements)
+    runtests.UPDATE_PERFORMANCE_BASELINES = False
+
+    with open(os.path.join(absolute_directory_path, "test_info.json")) as file:
+        baselines: dict = json.load(file)["performance"]["baselines"]
+
+    return (
+        expect(
+            recorded and baselines == {LABEL: BASELINE},
+            "recording a baseline writes it to test_info.json",
+            str(baselines),
+        )
+        and expect(
+            evaluate_quietly(absolute_directory_path, contents, {LABEL: BASELINE + 40}),
+            "a measurement within the tolerance passes",
+        )
+        and expect(
+            not evaluate_quietly(
+                absolute_directory_path, contents, {LABEL: BASELINE + 200}
+            ),
+            "a measurement beyond the tolerance fails",
+        )
+    )
+
+
+def write_bundle(absolute_bundle_path: str) -> None:
+    """
+    Writes a bundle in the layout that runtests.py build writes, holding one
+    performance test with a baseline.
+    """
+    test_info_contents: dict = {
+        "targets": [f"{LABEL}()"],
+        "used": [f"{LABEL}()"],
+        "dependencies": [],
+        "performance": {"tolerance": 0.05, "baselines": {LABEL: BASELINE}},
+    }
+    bundle_contents: dict = {
+        "version": runtests.VERSION,
+        "batches": [[["performance_test"]]],
+    }
+    files: dict[str, bytes] = {
+        "tests/performance_test/bin/TEST.8xp": LABEL.encode() + b"\0",
+        "tests/performance_test/autotest.json": json.dumps(AUTOTEST_CONTENTS).encode(),
+        "tests/performance_test/test_info.json": json.dumps(
+            test_info_contents
+        ).encode(),
+        "bundle.json": json.dumps(bundle_contents).encode(),
+    }
+
+    with tarfile.open(absolute_bundle_path, "w:gz") as bundle:
+        for arcname, data in files.items():
+            file_info = tarfile.TarInfo(arcname)
+            file_info.size = len(data)
+            bundle.addfile(file_info, io.BytesIO(data))
+
+    return
+
+
+def run_bundle(
+    absolute_directory_path: str, absolute_bundle_path: str, timings: str
+) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [
+            sys.executable,
+            os.path.join(ABSOLUTE_PATH_TO_PROJECT_DIRECTORY, "runtests.py"),
+            "--autotester",
+            os.path.join(
+                ABSOLUTE_PATH_TO_PROJECT_DIRECTORY, "tools", "stub_autotester.py"
+            ),
+            "run",
+            "--bundle",
+            absolute_bundle_path,
+        ],
+        cwd=absolute_directory_path,
+        env=os.environ | {"STUB_AUTOTESTER_TIMINGS": timings},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+    )
+
+
+def check_bundle(absolute_directory_path: str) -> bool:
+    absolute_bundle_path: str = os.path.join(
+        absolute_directory_path, "tests_bundle.tar.gz"
+    )
+    write_bundle(absolute_bundle_path)
+
+    for timings, passed, description in (
+        (f"{LABEL}={BASELINE + 40}", True, "a run within the tolerance passes"),
+        (f"{LABEL}={BASELINE + 200}", False, "a regression beyond the tolerance fails"),
+        ("", False, "a run without timing markers fails"),
+    ):
+        completed_process: subprocess.CompletedProcess = run_bundle(
+            absolute_directory_path, absolute_bundle_path, timings
+        )
+
+        if not expect(
+            (completed_process.returncode == 0) == passed,
+            f"{description} (exit code {completed_process.returncode})",
+            completed_process.stdout,
+        ):
+            return False
+
+    return True
+
+
+def main() -> int:
+    absolute_directory_path: str = tempfile.mkdtemp(prefix="check_performance_gate_")
+
+    try:
+        if not check_functions(absolute_directory_path) or not check_bundle(
+            absolute_directory_path
+        ):
+            return 1
+    finally:
+        shutil.rmtree(absolute_directory_path, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
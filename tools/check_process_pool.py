@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Checks that the process pool of runtests.py gives its workers the settings
+of the main process, whatever start method the workers are created with. It
+needs neither the CE toolchain nor an emulator: the workers parse a small
+assembly listing and report the build timeout they see.
+
+The check runs the pool with two jobs, as --jobs 2 does, and compares the
+results with those of a single job. It then starts a pool with each start
+method this platform has, including spawn and forkserver, which do not
+inherit the settings.
+"""
+
+import concurrent.futures
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import runtests
+
+BUILD_TIMEOUT: float = 1234.0
+LISTING: str = """\tsection\t.text,"ax",@progbits
+\tpublic\t__Z3foov
+__Z3foov:
+\tld\thl, -3
+\tcall\t__frameset
+\tcall\t__Z3barv
+\tld\tsp, ix
+\tpop\tix
+\tret
+"""
+
+
+def write_listings(absolute_directory_path: str, num_listings: int) -> list[str]:
+    absolute_listing_paths: list[str] = []
+
+    for index in range(num_listings):
+        absolute_listing_path: str = os.path.join(
+            absolute_directory_path, f"listing_{index}.src"
+        )
+
+        with open(absolute_listing_path, "w") as file:
+            file.write(LISTING)
+
+        absolute_listing_paths.append(absolute_listing_path)
+
+    return absolute_listing_paths
+
+
+def check_captures(
+    captures: list[dict], expected_result, counted: bool, description: str
+) -> bool:
+    """
+    counted: Whether the captures must hold the parser's hot path counters.
+    """
+    parser_name: str = runtests.extract_all_functions_from_object_file.__qualname__
+
+    for capture in captures:
+        if capture["result"] != expected_result:
+            print(f"FAILED: {description}: got {capture['result']!r}")
+            return False
+
+        if counted and parser_name not in capture["hot_path_counters"]:
+            print(f"FAILED: {description}: the hot path counters are missing")
+            return False
+
+    print(f"ok: {description}")
+    return True
+
+
+def main() -> int:
+    absolute_directory_path: str = tempfile.mkdtemp(prefix="check_process_pool_")
+    runtests.PROFILE_HOT_PATHS = True
+    runtests.DEFAULT_BUILD_TIMEOUT = BUILD_TIMEOUT
+
+    try:
+        absolute_listing_paths: list[str] = write_listings(absolute_directory_path, 4)
+        runtests.NUM_JOBS = 1
+        expected_functions: list = runtests.call_with_captured_output(
+            runtests.extract_all_functions_from_object_file, absolute_listing_paths[0]
+        )["result"]
+
+        runtests.NUM_JOBS = 2
+
+        if not check_captures(
+            runtests.call_in_process_pool(
+                runtests.extract_all_functions_from_object_file,
+                [(path,) for path in absolute_listing_paths],
+            ),
+            expected_functions,
+            True,
+            "two jobs parse like one and count hot paths",
+        ) or not check_captures(
+            runtests.call_in_process_pool(
+                runtests.get_test_timeout, [({}, "build"), ({}, "build")]
+            ),
+            BUILD_TIMEOUT,
+            False,
+            "two jobs see the build timeout",
+        ):
+            return 1
+
+        for start_method in multiprocessing.get_all_start_methods():
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=2,
+                mp_context=multiprocessing.get_context(start_method),
+                initializer=runtests.initialize_pool_worker,
+                initargs=(runtests.get_pool_worker_settings(),),
+            ) as pool:
+                parse_captures: list[dict] = list(
+                    pool.map(
+                        runtests.call_with_captured_output,
+                        [runtests.extract_all_functions_from_object_file] * 2,
+                        absolute_listing_paths[:2],
+                    )
+                )
+                timeout_captures: list[dict] = list(
+                    pool.map(
+                        runtests.call_with_captured_output,
+                        [runtests.get_test_timeout] * 2,
+                        [{}, {}],
+                        ["build", "build"],
+                    )
+                )
+
+            if not check_captures(
+                parse_captures,
+                expected_functions,
+                True,
+                f"{start_method} workers count hot paths",
+            ) or not check_captures(
+                timeout_captures,
+                BUILD_TIMEOUT,
+                False,
+                f"{start_method} workers see the build timeout",
+            ):
+                return 1
+    finally:
+        shutil.rmtree(absolute_directory_path, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Stands in for cemu-autotester so that the testing script can be exercised
+without an emulator or a ROM. Pass it to runtests.py with --autotester.
+
+Every hash of the autotest JSON file passes. The timings in the
+STUB_AUTOTESTER_TIMINGS environment variable, given as LABEL=CYCLES pairs
+separated by commas, are printed as performance markers for the tests whose
+programs hold that label as a string, as they do when they pass it to
+testutil_StartPerformanceTimer(). Only the transfer files are read, so tests
+run from a bundle work too.
+STUB_AUTOTESTER_DELAY is how many seconds each run takes, and
+STUB_AUTOTESTER_EXIT_CODE is the code it exits with.
+"""
+
+import json
+import os
+import sys
+import time
+
+PERFORMANCE_MARKER_PREFIX: str = "ATF_PERF"
+
+
+def main() -> int:
+    with open(sys.argv[-1], "r") as file:
+        contents: dict = json.load(file)
+
+    programs: bytes = b""
+
+    for transfer_file in contents["transfer_files"]:
+        if not os.path.exists(transfer_file):
+            print(f"Could not find the transfer file '{transfer_file}'.")
+            return 1
+
+        with open(transfer_file, "rb") as file:
+            programs += file.read()
+
+    time.sleep(float(os.environ.get("STUB_AUTOTESTER_DELAY", "0")))
+    print(f"Launching '{contents['target']['name']}'.")
+
+    for timing in os.environ.get("STUB_AUTOTESTER_TIMINGS", "").split(","):
+        label, _, cycles = timing.partition("=")
+
+        if label != "" and label.encode() + b"\0" in programs:
+            print(f"{PERFORMANCE_MARKER_PREFIX}|{label}|start|0")
+            print(f"{PERFORMANCE_MARKER_PREFIX}|{label}|stop|{cycles}")
+
+    for hash_id, test_hash in sorted(
+        contents["hashes"].items(), key=lambda item: int(item[0])
+    ):
+        print(f"[OK] Hash #{hash_id} ({test_hash.get('description', '')}) passed")
+
+    return int(os.environ.get("STUB_AUTOTESTER_EXIT_CODE", "0"))
+
+
+if __name__ == "__main__":
+    sys.exit(main())